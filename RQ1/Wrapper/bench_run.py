@@ -0,0 +1,57 @@
+import os
+import time
+import argparse
+import tempfile
+
+from run import iter_chunks, score_chunks, parse_entries
+from discovery import iter_java_files
+
+JAVA_TEMPLATE = """package bench.p{pkg};
+
+public class C{idx} {{
+    private int value;
+
+    public C{idx}(int value) {{
+        this.value = value;
+    }}
+
+    public int compute(int x) {{
+        int total = 0;
+        for (int i = 0; i < x; i++) {{
+            total += value * i;
+        }}
+        return total;
+    }}
+}}
+"""
+
+def make_tree(root, n_files, files_per_pkg=50):
+    for idx in range(n_files):
+        pkg = idx // files_per_pkg
+        pkg_dir = os.path.join(root, "src", "main", "java", "bench", f"p{pkg}")
+        os.makedirs(pkg_dir, exist_ok=True)
+        with open(os.path.join(pkg_dir, f"C{idx}.java"), "w") as f:
+            f.write(JAVA_TEMPLATE.format(pkg=pkg, idx=idx))
+
+def files_per_second(java_files, workers, chunk_size):
+    start = time.perf_counter()
+    scored = 0
+    for _, lines in score_chunks(iter_chunks(java_files, chunk_size), workers):
+        scored += len(parse_entries(lines))
+    elapsed = time.perf_counter() - start
+    return scored, elapsed, len(java_files) / elapsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare serial and pooled rsm.jar scoring on a synthetic tree.")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root, args.files)
+        java_files = list(iter_java_files(root))
+        print(f"synthetic tree: {len(java_files)} files")
+        for label, workers in (("serial", 1), (f"pool x{args.workers}", args.workers)):
+            scored, elapsed, rate = files_per_second(java_files, workers, args.chunk_size)
+            print(f"{label:>12}: {scored} scored in {elapsed:.1f}s ({rate:.1f} files/s)")
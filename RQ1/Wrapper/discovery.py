@@ -0,0 +1,50 @@
+import os
+from fnmatch import fnmatch
+
+DEFAULT_INCLUDES = ("*.java",)
+
+# Patterns containing "/" match the path relative to the root at any depth;
+# bare patterns match a single directory or file name.
+DEFAULT_EXCLUDES = (
+    "src/test",
+    "src/androidTest",
+    "src/testFixtures",
+    "src/integrationTest",
+    "src/generated",
+    ".*",
+)
+
+# Build output directories, pruned only outside source trees so packages
+# such as com.android.build are still scored.
+BUILD_DIRS = ("build", "target", "out", "bin", "gen", "generated")
+
+def matches(rel_path, patterns):
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        if "/" in pattern:
+            if fnmatch(rel_path, pattern) or fnmatch(rel_path, "*/" + pattern):
+                return True
+        elif fnmatch(name, pattern):
+            return True
+    return False
+
+def is_build_dir(rel_path, build_dirs=BUILD_DIRS):
+    parts = rel_path.split("/")
+    return parts[-1] in build_dirs and "src" not in parts[:-1]
+
+def iter_java_files(rootdir, include=DEFAULT_INCLUDES, exclude=DEFAULT_EXCLUDES, build_dirs=BUILD_DIRS):
+    """Yield files under rootdir matching `include` and not `exclude`.
+
+    Excluded and build directories are pruned from os.walk before it
+    descends, so test and build trees are never listed, and nothing on
+    disk is modified.
+    """
+    for subdir, dirs, files in os.walk(rootdir):
+        rel_dir = os.path.relpath(subdir, rootdir).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        dirs[:] = sorted(d for d in dirs
+                         if not matches(prefix + d, exclude) and not is_build_dir(prefix + d, build_dirs))
+        for f in sorted(files):
+            rel_path = prefix + f
+            if matches(rel_path, include) and not matches(rel_path, exclude):
+                yield os.path.join(subdir, f)
@@ -0,0 +1,56 @@
+import os
+
+REPORT_CSV = "report.csv"
+READABLE_THRESHOLD = 0.5
+
+def readability_level(score):
+    """rsm.jar scores are P(readable); 0.5 is the classifier's decision boundary."""
+    return "readable" if float(score) >= READABLE_THRESHOLD else "unreadable"
+
+class ReportWriter:
+    """report.csv written chunk by chunk, with a `.done` sidecar as checkpoint.
+
+    The sidecar lists every path whose chunk has finished, including files
+    rsm.jar failed to score, so with resume=True a restarted run skips them.
+    A torn last row left by a crash is truncated away before appending.
+    """
+
+    def __init__(self, path=REPORT_CSV, resume=False):
+        self.path = path
+        self.done_path = path + ".done"
+        self.done = set()
+        if resume and os.path.exists(path):
+            self.done.update(self._recover())
+            if os.path.exists(self.done_path):
+                with open(self.done_path, encoding="utf-8") as f:
+                    self.done.update(line.rstrip("\n") for line in f)
+            self.out = open(path, "a", encoding="utf-8")
+            if os.path.getsize(path) == 0:
+                self.out.write("file_name,score,level\n")
+            self.done_log = open(self.done_path, "a", encoding="utf-8")
+        else:
+            self.out = open(path, "w", encoding="utf-8")
+            self.out.write("file_name,score,level\n")
+            self.done_log = open(self.done_path, "w", encoding="utf-8")
+
+    def _recover(self):
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            f.truncate(end)
+        rows = data[:end].decode("utf-8", errors="ignore").splitlines()[1:]
+        return {row.rsplit(",", 2)[0] for row in rows}
+
+    def write(self, entries):
+        for path, score in entries:
+            self.out.write(f"{path},{score},{readability_level(score)}\n")
+        self.out.flush()
+
+    def mark_done(self, paths):
+        for path in paths:
+            self.done_log.write(path + "\n")
+        self.done_log.flush()
+
+    def close(self):
+        self.out.close()
+        self.done_log.close()
@@ -1,6 +1,14 @@
-import os, sys
+import os
+import argparse
 import subprocess
 import logging as log
+from itertools import chain, islice
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from score_cache import CACHE_DB, ScoreCache, file_digest
+from report_writer import REPORT_CSV, ReportWriter
+from discovery import BUILD_DIRS, DEFAULT_EXCLUDES, DEFAULT_INCLUDES, iter_java_files
 
 def is_valid_data_line(line: str) -> bool:
     return (
@@ -11,17 +19,19 @@ def is_valid_data_line(line: str) -> bool:
 
 log.basicConfig(level=log.ERROR)
 
-rootdir = sys.argv[1]
-verbose = "--verbose" in sys.argv
 chunk_size = 500
 rsm_jar = "rsm.jar"
-java_files = []
+SCORES_DIR = "readability_scores"
 
-for subdir, _, files in os.walk(rootdir):
-    for f in files:
-        java_files.append(os.path.join(subdir, f))
+def iter_chunks(files, size=chunk_size):
+    files = iter(files)
+    while True:
+        chunk = list(islice(files, size))
+        if not chunk:
+            return
+        yield chunk
 
-def run_chunk(chunk):
+def run_chunk(chunk, verbose=False):
     cmd = ["java", "-jar", rsm_jar] + chunk
     p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
     out, _ = p.communicate()
@@ -30,22 +40,189 @@ def run_chunk(chunk):
         log.error(f"exited - {p.returncode}")
     return lines
 
-all_lines = []
-for i in range(0, len(java_files), chunk_size):
-    print("new 500 files")
-    chunk = java_files[i : i + chunk_size]
-    all_lines.extend(run_chunk(chunk))
-
-entries = []
-for line in all_lines:
-    if not is_valid_data_line(line):
-        if verbose and line.strip() and not line.startswith("file\t"):
-            log.error(f"invalid line: {line}")
-        continue
-    path, score = line.split('\t')
-    entries.append((path, score))
-
-with open("report.csv", "w") as out:
-    out.write("file_name,score,level\n")
-    for path, score in entries:
-        out.write(f"{path},{score}\n")
+def score_chunks(chunks, workers=1, verbose=False):
+    """Score chunks on up to `workers` concurrent rsm.jar processes.
+
+    Yields (chunk, output_lines) in completion order. At most 2 * workers
+    chunks are in flight, so `chunks` may be a lazy iterator.
+    """
+    chunks = iter(chunks)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(run_chunk, c, verbose): c for c in islice(chunks, 2 * workers)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+            for c in islice(chunks, len(done)):
+                pending[pool.submit(run_chunk, c, verbose)] = c
+
+def parse_entries(lines, verbose=False):
+    entries = []
+    for line in lines:
+        if not is_valid_data_line(line):
+            if verbose and line.strip() and not line.startswith("file\t"):
+                log.error(f"invalid line: {line}")
+            continue
+        path, score = line.split('\t')
+        entries.append((path, score))
+    return entries
+
+def pending_files(rootdir, report, include=DEFAULT_INCLUDES, exclude=DEFAULT_EXCLUDES, build_dirs=BUILD_DIRS):
+    """(path, report) for each file under rootdir that the report does not cover yet."""
+    for path in iter_java_files(os.path.abspath(rootdir), include, exclude, build_dirs):
+        if path not in report.done:
+            yield path, report
+
+def split_cached(files, cache, to_score):
+    """Partition (path, report) pairs into cached scores and groups that still need scoring.
+
+    Returns the cached (path, score, report) entries and adds the rest to
+    to_score, which maps one representative path per distinct content
+    digest to (digest, [(path, report) with that content]), so identical
+    files, e.g. vendored across projects, are scored once. Returns the
+    representatives added by this call as well. Files whose content is
+    already waiting in to_score join that group.
+    """
+    entries = []
+    added = []
+    representative = {digest: path for path, (digest, _) in to_score.items() if digest is not None}
+    for path, report in files:
+        if cache is None:
+            to_score[path] = (None, [(path, report)])
+            added.append(path)
+            continue
+        try:
+            digest = file_digest(path)
+        except OSError as e:
+            log.error(f"unreadable file {path}: {e}")
+            continue
+        if digest in representative:
+            to_score[representative[digest]][1].append((path, report))
+            continue
+        score = cache.get(digest)
+        if score is not None:
+            entries.append((path, score, report))
+        else:
+            representative[digest] = path
+            to_score[path] = (digest, [(path, report)])
+            added.append(path)
+    return entries, added
+
+def list_projects(group_dir):
+    """Project checkouts directly under a group dir such as Industry-Backed/."""
+    return sorted(
+        d for d in os.listdir(group_dir)
+        if os.path.isdir(os.path.join(group_dir, d)) and not d.startswith(".") and d != SCORES_DIR
+    )
+
+def group_by_report(entries):
+    """(report, [(path, score)]) for (path, score, report) entries."""
+    by_report = defaultdict(list)
+    for path, score, report in entries:
+        by_report[report].append((path, score))
+    return by_report.items()
+
+def score_projects(projects, cache, workers=1, size=chunk_size, verbose=False, resume=False,
+                   include=DEFAULT_INCLUDES, exclude=DEFAULT_EXCLUDES, build_dirs=BUILD_DIRS):
+    """Score (rootdir, report_path) projects on one shared pool of scorers.
+
+    Projects are queued largest first and chunks may span project
+    boundaries, so small repos fill in behind large ones instead of
+    leaving scorer slots idle. Each file's row goes to its own project's report.
+    Sizes come from a counting walk; files are then discovered lazily, one
+    chunk at a time as scorer slots free up, so only the chunks in flight
+    are held in memory.
+    """
+    reports = []
+    sized = []
+    for rootdir, report_path in projects:
+        report = ReportWriter(report_path, resume=resume)
+        reports.append(report)
+        n_files = sum(1 for _ in pending_files(rootdir, report, include, exclude, build_dirs))
+        sized.append((n_files, rootdir, report))
+        print(f"{rootdir}: {n_files} files to score")
+    sized.sort(key=lambda item: item[0], reverse=True)
+    files = chain.from_iterable(pending_files(rootdir, report, include, exclude, build_dirs)
+                                for _, rootdir, report in sized)
+
+    # Representatives of the chunks handed to the pool and not scored yet
+    to_score = {}
+
+    def chunks_to_score():
+        ready = []
+        for batch in iter_chunks(files, size):
+            entries, added = split_cached(batch, cache, to_score)
+            for report, rows in group_by_report(entries):
+                report.write(rows)
+                report.mark_done(path for path, _ in rows)
+            ready.extend(added)
+            while len(ready) >= size:
+                yield ready[:size]
+                ready = ready[size:]
+        if ready:
+            yield ready
+
+    for chunk, lines in score_chunks(chunks_to_score(), workers, verbose):
+        print(f"scored {len(chunk)} files")
+        rows = []
+        new_scores = []
+        for path, score in parse_entries(lines, verbose):
+            if path not in to_score:
+                continue
+            digest, paths = to_score[path]
+            rows.extend((p, score, report) for p, report in paths)
+            if digest is not None:
+                new_scores.append((digest, score))
+        for report, report_rows in group_by_report(rows):
+            report.write(report_rows)
+        if cache is not None:
+            cache.put_many(new_scores)
+        finished = [(p, None, report) for rep in chunk for p, report in to_score.pop(rep)[1]]
+        for report, done in group_by_report(finished):
+            report.mark_done(path for path, _ in done)
+
+    for report in reports:
+        report.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score Java files with rsm.jar into report.csv.")
+    parser.add_argument("rootdir", help="project checkout, or a group directory with --group")
+    parser.add_argument("--group", action="store_true",
+                        help="score every project under rootdir into readability_scores/<project>_readability.csv")
+    parser.add_argument("--projects", nargs="+", help="with --group, only score these projects")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of rsm.jar processes running at once")
+    parser.add_argument("--chunk-size", type=int, default=chunk_size,
+                        help="files passed to each rsm.jar invocation")
+    parser.add_argument("--cache", default=CACHE_DB, help="score cache database")
+    parser.add_argument("--no-cache", action="store_true", help="rescore every file")
+    parser.add_argument("--output", default=REPORT_CSV, help="report CSV path")
+    parser.add_argument("--resume", action="store_true",
+                        help="keep an existing report and skip files it already covers")
+    parser.add_argument("--include", action="append", default=[],
+                        help="glob of files to score (default: *.java)")
+    parser.add_argument("--exclude", action="append", default=[],
+                        help="extra glob of files or directories to skip")
+    parser.add_argument("--keep-tests", action="store_true",
+                        help="do not apply the default test/build exclusions")
+    args = parser.parse_args()
+
+    if args.group:
+        scores_dir = os.path.join(args.rootdir, SCORES_DIR)
+        os.makedirs(scores_dir, exist_ok=True)
+        projects = [(os.path.join(args.rootdir, name), os.path.join(scores_dir, f"{name}_readability.csv"))
+                    for name in args.projects or list_projects(args.rootdir)]
+    else:
+        projects = [(args.rootdir, args.output)]
+
+    cache = None if args.no_cache else ScoreCache(args.cache)
+    score_projects(
+        projects, cache, args.workers, args.chunk_size, args.verbose, args.resume,
+        include=tuple(args.include) or DEFAULT_INCLUDES,
+        exclude=tuple(args.exclude) + (() if args.keep_tests else DEFAULT_EXCLUDES),
+        build_dirs=() if args.keep_tests else BUILD_DIRS,
+    )
+    if cache is not None:
+        print(f"cache: {cache.hits} hits, {cache.misses} misses")
+        cache.close()
@@ -0,0 +1,56 @@
+import os
+import hashlib
+import sqlite3
+
+CACHE_DB = "score_cache.sqlite"
+CLASSIFIER_FILES = ("rsm.jar", "readability.classifier")
+
+def file_digest(path, block_size=1 << 16):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def classifier_version(paths=CLASSIFIER_FILES):
+    """Fingerprint of the scorer so a new jar or model invalidates old scores."""
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(os.path.basename(path).encode())
+        if os.path.exists(path):
+            h.update(file_digest(path).encode())
+    return h.hexdigest()[:16]
+
+class ScoreCache:
+    """SQLite store of readability scores keyed by (content digest, classifier version)."""
+
+    def __init__(self, db_path=CACHE_DB, version=None):
+        self.version = version or classifier_version()
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "digest TEXT NOT NULL, version TEXT NOT NULL, score TEXT NOT NULL, "
+            "PRIMARY KEY (digest, version))"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest):
+        row = self.conn.execute(
+            "SELECT score FROM scores WHERE digest = ? AND version = ?", (digest, self.version)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put_many(self, items):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO scores (digest, version, score) VALUES (?, ?, ?)",
+            [(digest, self.version, score) for digest, score in items],
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,51 @@
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+import networkx as nx
+
+from centrality_engine import graph_to_csr, katz, max_out_degree, pagerank
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def run(n_nodes, avg_degree, seed=0):
+    G = nx.gnm_random_graph(n_nodes, n_nodes * avg_degree, seed=seed, directed=True)
+    alpha = 0.9 / max(d for _, d in G.out_degree())
+
+    nx_pr, nx_pr_t, nx_pr_mem = measure(lambda: nx.pagerank(G, alpha=0.85, weight=None))
+    nx_katz, nx_katz_t, nx_katz_mem = measure(
+        lambda: nx.katz_centrality(G, alpha=alpha, beta=1.0, max_iter=1000, tol=1e-6))
+
+    (nodes, A), csr_t, csr_mem = measure(lambda: graph_to_csr(G))
+    sp_pr, sp_pr_t, sp_pr_mem = measure(lambda: pagerank(A, alpha=0.85))
+    sp_katz, sp_katz_t, sp_katz_mem = measure(
+        lambda: katz(A, alpha=0.9 / max_out_degree(A), beta=1.0, max_iter=1000, tol=1e-6))
+
+    pr_diff = max(abs(nx_pr[n] - sp_pr[i]) for i, n in enumerate(nodes))
+    katz_diff = max(abs(nx_katz[n] - sp_katz[i]) for i, n in enumerate(nodes))
+    print(f"{n_nodes:>8} nodes | networkx pagerank {nx_pr_t:7.3f}s {nx_pr_mem:7.1f}MiB"
+          f" katz {nx_katz_t:7.3f}s {nx_katz_mem:7.1f}MiB"
+          f" | csr build {csr_t:6.3f}s {csr_mem:6.1f}MiB"
+          f" pagerank {sp_pr_t:6.3f}s {sp_pr_mem:6.1f}MiB"
+          f" katz {sp_katz_t:6.3f}s {sp_katz_mem:6.1f}MiB"
+          f" | max diff pr {pr_diff:.2e} katz {katz_diff:.2e}")
+    assert np.isclose(pr_diff, 0, atol=1e-6) and np.isclose(katz_diff, 0, atol=1e-6)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the sparse centrality engine against NetworkX.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--avg-degree", type=int, default=5)
+    args = parser.parse_args()
+    for n in args.sizes:
+        run(n, args.avg_degree)
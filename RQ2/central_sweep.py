@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+from scipy.stats import norm
+
+from group_dataset import CENTRALITY, READABILITY
+
+THRESHOLDS = (0.05, 0.1, 0.2)
+METRICS = ('pagerank', 'katz_centrality')
+
+
+def project_grid(centrality, readability, thresholds=THRESHOLDS, metrics=METRICS):
+    """Readability of each project's top-k central files for every threshold x metric.
+
+    `centrality` has group, project, key and the metric columns;
+    `readability` has group, project, key and score. Each project is ranked
+    once per metric (ties broken by row order, as DataFrame.nlargest does).
+    A readability row belongs to the top fraction t of its project when the
+    best-ranked centrality file sharing its key ranks within ceil(N * t), so
+    after sorting rows by that rank every cut is a prefix, and the count,
+    sum and sum of squares of scores for all cuts come from one cumulative
+    sum and a searchsorted over the whole grid.
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    projects = centrality[['group', 'project']].drop_duplicates().reset_index(drop=True)
+    code_of = pd.MultiIndex.from_frame(projects)
+    c_codes = code_of.get_indexer(pd.MultiIndex.from_frame(centrality[['group', 'project']]))
+    r_codes = code_of.get_indexer(pd.MultiIndex.from_frame(readability[['group', 'project']]))
+    scores = readability['score'].to_numpy(dtype=float)
+    # Missing scores are skipped, as Series.mean()/std() skip them
+    keep = (r_codes >= 0) & ~np.isnan(scores)
+    r_codes = r_codes[keep]
+    r_keys = readability['key'].to_numpy()[keep]
+    scores = scores[keep]
+
+    n_files = np.bincount(c_codes, minlength=len(projects))
+    # k[p, t]: number of files selected in project p at threshold t
+    k = np.ceil(n_files[:, None] * thresholds[None, :]).astype(np.int64)
+    stride = int(n_files.max(initial=0)) + 2
+
+    tables = []
+    for metric in metrics:
+        ranks = (centrality.assign(code=c_codes)
+                 .groupby('code', sort=False)[metric].rank(method='first', ascending=False))
+        best = (pd.DataFrame({'code': c_codes, 'key': centrality['key'].to_numpy(), 'rank': ranks.to_numpy()})
+                .dropna(subset=['key']).groupby(['code', 'key'])['rank'].min())
+        first_rank = best.reindex(pd.MultiIndex.from_arrays([r_codes, r_keys])).to_numpy()
+        # Unmatched rows sort after every cut
+        first_rank = np.where(np.isnan(first_rank), stride - 1, first_rank).astype(np.int64)
+
+        order = np.lexsort((first_rank, r_codes))
+        combined = r_codes[order] * stride + first_rank[order]
+        s1 = np.concatenate([[0.0], np.cumsum(scores[order])])
+        s2 = np.concatenate([[0.0], np.cumsum(scores[order] ** 2)])
+        base = np.arange(len(projects))[:, None] * stride
+        start = np.searchsorted(combined, base, side='left')
+        end = np.searchsorted(combined, base + k, side='right')
+
+        n = end - start
+        total = s1[end] - s1[start]
+        total_sq = s2[end] - s2[start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, total / n, np.nan)
+            var = np.where(n > 1, (total_sq - total ** 2 / n) / (n - 1), np.nan)
+        tables.append(pd.DataFrame({
+            'group': np.repeat(projects['group'].to_numpy(), len(thresholds)),
+            'project': np.repeat(projects['project'].to_numpy(), len(thresholds)),
+            'metric': metric,
+            'threshold': np.tile(thresholds, len(projects)),
+            'n_selected': k.ravel(),
+            'n_matched': n.ravel(),
+            'score_sum': total.ravel(),
+            'mean': mean.ravel(),
+            'std': np.sqrt(np.maximum(var, 0)).ravel(),
+        }))
+    return pd.concat(tables, ignore_index=True)
+
+
+def group_grid(projects, groups):
+    """Weighted group means, variances and z-tests for every threshold x metric.
+
+    Aggregates project_grid() rows as the per-threshold analysis does: the
+    group mean weights project means by matched files, and the variance of
+    that mean is sum(n * std^2) / (sum n)^2. The z-test compares groups[0]
+    with groups[1]; its statistic and p-value are repeated on both rows.
+    """
+    matched = projects[projects['n_matched'] > 0].assign(
+        var_sum=lambda df: (df['n_matched'] * df['std'] ** 2).fillna(0.0))
+    stats = matched.groupby(['metric', 'threshold', 'group']).agg(
+        n_projects=('project', 'size'), n_files=('n_matched', 'sum'),
+        score_sum=('score_sum', 'sum'), var_sum=('var_sum', 'sum')).reset_index()
+    stats['weighted_mean'] = stats['score_sum'] / stats['n_files']
+    stats['variance'] = stats['var_sum'] / stats['n_files'] ** 2
+    stats['std_error'] = np.sqrt(stats['variance'])
+    stats = stats.drop(columns=['score_sum', 'var_sum'])
+
+    wide = stats.pivot(index=['metric', 'threshold'], columns='group', values=['weighted_mean', 'variance'])
+    if len(groups) >= 2 and all(g in wide['weighted_mean'] for g in groups[:2]):
+        diff = wide['weighted_mean'][groups[0]] - wide['weighted_mean'][groups[1]]
+        z = diff / np.sqrt(wide['variance'][groups[0]] + wide['variance'][groups[1]])
+        tests = pd.DataFrame({'z_stat': z, 'p_value': 2 * (1 - norm.cdf(np.abs(z)))}).reset_index()
+        stats = stats.merge(tests, on=['metric', 'threshold'], how='left')
+    return stats.sort_values(['metric', 'threshold', 'group']).reset_index(drop=True)
+
+
+def sweep(dataset, groups, thresholds=THRESHOLDS, metrics=METRICS):
+    """(project table, group table) for a threshold x metric grid over a GroupDataset."""
+    in_groups = ds.field('group').isin(list(groups))
+    centrality = dataset.load(CENTRALITY, ['group', 'project', 'key', *metrics], in_groups)
+    readability = dataset.load(READABILITY, ['group', 'project', 'key', 'score'], in_groups)
+    projects = project_grid(centrality, readability, thresholds, metrics)
+    return projects, group_grid(projects, list(groups))
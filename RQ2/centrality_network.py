@@ -1,208 +1,155 @@
 import os
-import re
-import json
 import logging
-import networkx as nx
-from github import Github
+import argparse
+import time
+import hashlib
+import numpy as np
 import pandas as pd
-from concurrent.futures import ProcessPoolExecutor
-from time import sleep
-from datetime import datetime
+import scipy.sparse as sp
+from git_commits import iter_local_commits, resolve_head
+from github_commits import GitHubCommitFetcher
+from cochange import TOUCHES, CoChangeAccumulator, author_matrix, cochange_matrix, commit_times, decay_weights
+from centrality_engine import ConvergenceError, katz, max_out_degree, pagerank, pagerank_batch
+from graph_store import GraphStore
+from java_index import JavaIndex
+from import_resolver import ImportResolver
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# File paths for saving/loading
-CLASS_TO_FILE_JSON = "class_to_file.json"
-GRAPH_COMMITS_GPICKLE = "graph_commits.gpickle"
-GRAPH_FULL_GPICKLE = "graph_full.gpickle"
-PROCESSED_FILES_JSON = "processed_files.json"
-COMMIT_CHECKPOINT_JSON = "commit_checkpoint.json"
+# Per-project state lives in <STATE_ROOT>/<project>/
+STATE_ROOT = "centrality_state"
+JAVA_INDEX_JSON = "java_index.json"
+GRAPH_STORE_DIR = "graph_store"
+VECTORS_NPZ = "centrality_vectors.npz"
+DEPENDENCIES = "dependencies"
 OUTPUT_CSV = "android_centrality.csv"
-
-
-def check_rate_limit(g):
-    """Check GitHub API rate limit and sleep if necessary."""
-    try:
-        rate_limit = g.get_rate_limit()
-        if rate_limit.core.remaining < 10:
-            reset_time = rate_limit.core.reset.timestamp()
-            current_time = datetime.now().timestamp()
-            sleep_time = reset_time - current_time + 1
-            logger.info(f"Rate limit low. Sleeping for {sleep_time:.1f} seconds.")
-            sleep(sleep_time)
-    except Exception as e:
-        logger.error(f"Error checking rate limit: {e}")
-
-
-def get_classes_from_file(file_path):
-    """Extract class names from a Java file using regex."""
+DAY = 86400
+
+
+def get_commits(root_dir, backend="local", fetcher=None, skip=0, max_commits=None, rev=None, since=None):
+    """Commit stream from the local clone at root_dir or, with backend="api", from GitHub.
+
+    Only commits reachable from `rev` and newer than `since` are listed.
+    """
+    if backend == "local":
+        return iter_local_commits(root_dir, skip=skip, max_commits=max_commits, rev=rev or "HEAD", since=since)
+    if backend == "api":
+        return fetcher.iter_commits(skip=skip, max_commits=max_commits, rev=rev, since=since)
+    raise ValueError(f"Unknown commit backend: {backend}")
+
+
+def get_head(root_dir, backend="local", fetcher=None):
+    if backend == "local":
+        return resolve_head(root_dir)
+    if backend == "api":
+        return fetcher.resolve_head()
+    raise ValueError(f"Unknown commit backend: {backend}")
+
+
+def process_commits(store, root_dir, backend="local", fetcher=None, max_commits=None, incremental=False):
+    """Record commit history in the graph store as author->file touch edges.
+
+    Each ingestion pass pins the head it reads up to and, once complete,
+    records it as head_sha; with incremental=True a later pass ingests only
+    the commits after head_sha. Commit ordinals continue across passes
+    (n_commits), so touches of different passes never share one. An
+    interrupted pass resumes after its last checkpoint, taken every 100
+    commits by appending only the new touches.
+    """
+    ingest = store.state.get("ingest")
+    if ingest is None:
+        since = store.state.get("head_sha")
+        if since and not incremental:
+            logger.info(f"History already ingested up to {since}; run incrementally to add newer commits")
+            return store
+        head = get_head(root_dir, backend, fetcher)
+        if head == since:
+            logger.info(f"No new commits since {since}")
+            return store
+        ingest = {"since": since, "head": head, "base": store.state.get("n_commits", 0), "done": -1}
+        store.checkpoint(ingest=ingest)
+    start_index = ingest["done"] + 1
+    logger.info(f"Processing commits from the {backend} backend up to {ingest['head']}"
+                f"{' since ' + ingest['since'] if ingest['since'] else ''}, starting at {start_index}")
+    # max_commits caps the whole pass; a resumed pass only lists the rest
+    remaining = None if max_commits is None else max(max_commits - start_index, 0)
+    commits = get_commits(root_dir, backend, fetcher, skip=start_index, max_commits=remaining,
+                          rev=ingest["head"], since=ingest["since"])
+
+    acc = CoChangeAccumulator(store, root_dir)
+    i = start_index - 1
+    complete = True
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        package_pattern = r'^\s*package\s+([\w\.]+)\s*;'
-        class_pattern = r'^\s*(?:public|private|protected)?\s*(class|interface|enum|@interface)\s+(\w+)\s+'
-        package_match = re.search(package_pattern, content, re.MULTILINE)
-        package = package_match.group(1) if package_match else ''
-        class_matches = re.findall(class_pattern, content, re.MULTILINE)
-        return [f"{package}.{class_name}" if package else class_name for class_name in class_matches]
-    except (IOError, UnicodeDecodeError) as e:
-        logger.error(f"Error reading {file_path}: {e}")
-        return []
-
-
-def get_imports(file_path):
-    """Extract import statements from a Java file using regex."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        import_pattern = r'^\s*import\s+([\w\.]+)\s*;'
-        imports = re.findall(import_pattern, content, re.MULTILINE)
-        return [imp for imp in imports if not imp.startswith(('java.', 'javax.', 'org.junit', 'org.mockito'))]
-    except (IOError, UnicodeDecodeError) as e:
-        logger.error(f"Error reading {file_path}: {e}")
-        return []
-
-
-def build_class_to_file_mapping(root_dir, max_workers=4):
-    """Build a mapping of class names to file paths, with parallel processing."""
-    if os.path.exists(CLASS_TO_FILE_JSON):
-        try:
-            with open(CLASS_TO_FILE_JSON, 'r') as f:
-                logger.info(f"Loading class-to-file mapping from {CLASS_TO_FILE_JSON}")
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.warning(f"Could not load {CLASS_TO_FILE_JSON}: {e}. Rebuilding mapping.")
-
-    class_to_file = {}
-    java_files = [os.path.join(subdir, file) for subdir, _, files in os.walk(root_dir)
-                  for file in files if file.endswith('.java')]
-    logger.info(f"Found {len(java_files)} Java files to process")
-
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        future_to_file = {executor.submit(get_classes_from_file, file_path): file_path
-                          for file_path in java_files}
-        for future in future_to_file:
-            file_path = future_to_file[future]
+        for i, commit in enumerate(commits, start=start_index):
             try:
-                classes = future.result()
-                for cls in classes:
-                    class_to_file[cls] = file_path
+                if commit.author is None:
+                    logger.warning(f"Commit {commit.sha} has no valid author. Skipping.")
+                    continue
+                acc.add_commit(ingest["base"] + i, commit.author, commit.timestamp,
+                               [f for f in commit.files if f.endswith('.java')])
+                if (i + 1) % 100 == 0:
+                    try:
+                        store.checkpoint(ingest=dict(ingest, done=i))
+                        logger.info(f"Processed {i + 1} commits, saved checkpoint")
+                    except Exception as e:
+                        logger.error(f"Error saving commit checkpoint: {e}")
             except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-
-    try:
-        with open(CLASS_TO_FILE_JSON, 'w') as f:
-            json.dump(class_to_file, f)
-        logger.info(f"Saved class-to-file mapping to {CLASS_TO_FILE_JSON}")
-    except IOError as e:
-        logger.error(f"Error saving {CLASS_TO_FILE_JSON}: {e}")
-
-    return class_to_file
-
-
-def process_commits(g, repo, root_dir, max_commits=1000):
-    if os.path.exists(GRAPH_COMMITS_GPICKLE):
-        try:
-            G = nx.read_gpickle(GRAPH_COMMITS_GPICKLE)
-            logger.info(f"Loaded commit graph from {GRAPH_COMMITS_GPICKLE}")
-            with open(COMMIT_CHECKPOINT_JSON, 'r') as f:
-                checkpoint = json.load(f)
-            start_index = checkpoint.get("last_processed", 0) + 1
-        except (FileNotFoundError, json.JSONDecodeError, nx.NetworkXError) as e:
-            logger.warning(f"Could not load commit graph or checkpoint: {e}. Starting from scratch.")
-            G = nx.DiGraph()
-            start_index = 0
-    else:
-        G = nx.DiGraph()
-        start_index = 0
-
-    try:
-        commits = list(repo.get_commits()[:max_commits])
-        total_commits = len(commits)
-        logger.info(f"Processing up to {total_commits} commits")
+                logger.error(f"Error processing commit {i}: {e}")
+                continue
     except Exception as e:
         logger.error(f"Error fetching commits: {e}")
-        return G
+        complete = False
 
-    for i in range(start_index, total_commits):
-        if i % 100 == 0:
-            check_rate_limit(g)
-        try:
-            commit = commits[i]
-            if commit.author is None or not hasattr(commit.author, 'login'):
-                logger.warning(f"Commit {commit.sha} has no valid author. Skipping.")
-                continue
-            author = commit.author.login
-            files_changed = [f.filename for f in commit.files if f.filename.endswith('.java')]
-            for f in files_changed:
-                full_path = os.path.join(root_dir, f)
-                if os.path.exists(full_path):
-                    G.add_edge(author, full_path)
-            # Co-changing files
-            for j, f1 in enumerate(files_changed):
-                for f2 in files_changed[j + 1:]:
-                    full_path1 = os.path.join(root_dir, f1)
-                    full_path2 = os.path.join(root_dir, f2)
-                    if os.path.exists(full_path1) and os.path.exists(full_path2):
-                        G.add_edge(full_path1, full_path2)
-                        G.add_edge(full_path2, full_path1)
-            if (i + 1) % 100 == 0:
-                try:
-                    nx.write_gpickle(G, GRAPH_COMMITS_GPICKLE)
-                    with open(COMMIT_CHECKPOINT_JSON, 'w') as f:
-                        json.dump({"last_processed": i}, f)
-                    logger.info(f"Processed {i + 1} commits, saved checkpoint")
-                except Exception as e:
-                    logger.error(f"Error saving commit checkpoint: {e}")
-        except Exception as e:
-            logger.error(f"Error processing commit {i}: {e}")
-            continue
-
-    # Final save
+    # Final save; an interrupted pass keeps its progress to resume from
     try:
-        nx.write_gpickle(G, GRAPH_COMMITS_GPICKLE)
-        with open(COMMIT_CHECKPOINT_JSON, 'w') as f:
-            json.dump({"last_processed": total_commits - 1}, f)
-        logger.info("Completed commit processing and saved final graph")
+        if complete:
+            store.checkpoint(ingest=None, head_sha=ingest["head"], n_commits=ingest["base"] + i + 1)
+            logger.info(f"Completed commit processing at commit {i + 1} and saved graph store")
+        else:
+            store.checkpoint(ingest=dict(ingest, done=i))
     except Exception as e:
-        logger.error(f"Error saving final commit graph: {e}")
-
-    return G
-
-
-def add_dependency_edges(G, class_to_file, root_dir):
-    """Add dependency edges to the graph based on file imports."""
-    if os.path.exists(PROCESSED_FILES_JSON):
-        try:
-            with open(PROCESSED_FILES_JSON, 'r') as f:
-                processed_files = set(json.load(f))
-            logger.info(f"Loaded processed files from {PROCESSED_FILES_JSON}")
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.warning(f"Could not load {PROCESSED_FILES_JSON}: {e}. Starting from scratch.")
-            processed_files = set()
-    else:
-        processed_files = set()
-
-    all_files = [node for node in G.nodes() if node.endswith('.java')]
-    logger.info(f"Processing dependencies for {len(all_files)} files")
-
-    for i, file in enumerate(all_files):
-        if file in processed_files:
-            continue
+        logger.error(f"Error saving final commit checkpoint: {e}")
+
+    return store
+
+
+def add_dependency_edges(store, index):
+    """Add dependency edges to the graph based on file imports in the Java index.
+
+    Imports are resolved for the Java files touched by commits (targets
+    interned here are not themselves expanded). The layer is rebuilt
+    whenever that file list (compared by hash) or the index changed since
+    it was built, which resolving from the index makes cheap; otherwise an
+    interrupted pass resumes after its last checkpoint. Resolution counts
+    are saved with each checkpoint (import_stats), so they always cover
+    the whole layer.
+    """
+    resolver = ImportResolver(index)
+    touched = np.unique(store.edges(TOUCHES)['dst'])
+    all_files = sorted(store.nodes[i] for i in touched if store.nodes[i].endswith('.java'))
+    files_hash = hashlib.sha256("\n".join(all_files).encode("utf-8")).hexdigest()
+    if (store.state.get("dependency_files_hash") != files_hash
+            or store.state.get("dependency_generation") != index.generation):
+        # Indices into the file list, or the imports behind them, are stale
+        store.reset_layer(DEPENDENCIES)
+        store.state.update(dependency_files_hash=files_hash, dependency_generation=index.generation,
+                           dependencies_done=-1, import_stats={})
+    start_index = store.state.get("dependencies_done", -1) + 1
+    # Counts of the files resolved by earlier passes over this layer
+    resolver.stats.update(store.state.get("import_stats", {}))
+    logger.info(f"Processing dependencies for {len(all_files)} files, starting at {start_index}")
+
+    for i in range(start_index, len(all_files)):
+        file = all_files[i]
         try:
-            imports = get_imports(file)
-            dependencies = [class_to_file[imp] for imp in imports if imp in class_to_file]
-            for dep in dependencies:
-                if os.path.exists(dep):
-                    G.add_edge(file, dep)
-            processed_files.add(file)
+            targets = [store.intern(dep) for dep in sorted(resolver.resolve(file))]
+            if targets:
+                store.add_edges(DEPENDENCIES, store.node_index[file], targets)
             if (i + 1) % 100 == 0:
                 try:
-                    with open(PROCESSED_FILES_JSON, 'w') as f:
-                        json.dump(list(processed_files), f)
-                    nx.write_gpickle(G, GRAPH_FULL_GPICKLE)
+                    store.checkpoint(dependencies_done=i, import_stats=dict(resolver.stats))
                     logger.info(f"Processed {i + 1} files for dependencies, saved checkpoint")
                 except Exception as e:
                     logger.error(f"Error saving dependency checkpoint: {e}")
@@ -212,68 +159,256 @@ def add_dependency_edges(G, class_to_file, root_dir):
 
     # Final save
     try:
-        with open(PROCESSED_FILES_JSON, 'w') as f:
-            json.dump(list(processed_files), f)
-        nx.write_gpickle(G, GRAPH_FULL_GPICKLE)
-        logger.info("Completed dependency processing and saved final graph")
+        store.checkpoint(dependencies_done=len(all_files) - 1, import_stats=dict(resolver.stats))
+        logger.info("Completed dependency processing and saved graph store")
+        logger.info(f"Import resolution: {resolver.summary()}")
     except Exception as e:
-        logger.error(f"Error saving final dependency graph: {e}")
-
-    return G
-
-
-def compute_centrality(G):
-    """Compute Katz centrality and PageRank for all Java files."""
+        logger.error(f"Error saving final dependency checkpoint: {e}")
+
+    return store
+
+
+def graph_adjacency(store, weighted=False, max_commit_files=None, half_life=None, now=None):
+    """Sparse adjacency of the author/co-change/dependency graph in the store.
+
+    Weighted entries sum authorship counts, co-change counts and dependency
+    edges; unweighted, every non-zero entry becomes 1, which is the plain
+    directed graph the thesis results were computed on. Co-change is derived
+    from the stored touches, skipping commits with more than
+    max_commit_files files. With half_life (seconds), each commit's
+    authorship and co-change contributions decay as 0.5 ** (age /
+    half_life), age counted back from `now` (default: the latest commit);
+    dependency edges describe the current code and keep weight 1. Decay
+    implies a weighted graph.
+    """
+    n = store.n_nodes
+    touches = store.edges(TOUCHES)
+    deps = store.edges(DEPENDENCIES)
+    touch_weights = commit_weights = None
+    if half_life is not None and len(touches):
+        now = touches['time'].max() if now is None else now
+        touch_weights = decay_weights(touches['time'], now, half_life)
+        commit_weights = decay_weights(commit_times(touches), now, half_life)
+    A = (author_matrix(touches, n, touch_weights)
+         + cochange_matrix(touches, n, commit_weights, max_commit_files=max_commit_files)
+         + sp.csr_matrix((np.ones(len(deps)), (deps['src'], deps['dst'])), shape=(n, n))).tocsr()
+    if not weighted and half_life is None:
+        A.data[:] = 1.0
+    return A
+
+
+def load_vectors(path, n_nodes):
+    """Previous PageRank/Katz vectors by node index, NaN for nodes they lack."""
+    vectors = {"pagerank": np.full(n_nodes, np.nan), "katz": np.full(n_nodes, np.nan)}
+    if path and os.path.exists(path):
+        try:
+            with np.load(path) as data:
+                for name in vectors:
+                    prev = data[name][:n_nodes]
+                    vectors[name][:len(prev)] = prev
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Could not load {path}: {e}. Starting cold.")
+    return vectors
+
+
+def _warm_start(prev, active):
+    """Start vector for the active nodes; nodes new since the last run get 1/N."""
+    x = prev[active]
+    if np.isnan(x).all():
+        return None
+    return np.where(np.isnan(x), 1.0 / len(x), x)
+
+
+def compute_centrality(store, weighted=False, max_commit_files=None, output_csv=OUTPUT_CSV, vectors_path=None):
+    """Compute Katz centrality and PageRank for all Java files.
+
+    The stored graph is assembled once into a sparse CSR matrix and both
+    measures run as vectorized power iterations (see centrality_engine).
+    With weighted=True, edge weights (co-change and authorship counts) scale
+    each edge's contribution; otherwise every edge counts once. Files that
+    no longer exist are dropped from the graph. With vectors_path, both
+    iterations start from the vectors of the previous run, which after an
+    incremental update are already close to the new fixed point, and the
+    new vectors are saved there.
+    """
+    nodes = np.array(store.nodes, dtype=object)
+    is_file = np.array([node.endswith('.java') for node in nodes], dtype=bool)
+    active = ~is_file | np.array([bool(f) and os.path.exists(node) for node, f in zip(nodes, is_file)])
+    A = graph_adjacency(store, weighted, max_commit_files)[active][:, active]
+    prev = load_vectors(vectors_path, len(nodes))
+    n = int(active.sum())
     try:
-        max_degree = max(d for n, d in G.out_degree()) if G.number_of_nodes() > 0 else 1
-        alpha = 0.9 / max_degree
-        katz_centrality = nx.katz_centrality(G, alpha=alpha, beta=1.0, max_iter=1000, tol=1e-6)
+        alpha = 0.9 / max_out_degree(A)
+        katz_centrality = katz(A, alpha=alpha, beta=1.0, nstart=_warm_start(prev["katz"], active),
+                               max_iter=1000, tol=1e-6)
         logger.info("Computed Katz centrality")
-    except nx.PowerIterationFailedConvergence as e:
+    except ConvergenceError as e:
         logger.error(f"Katz centrality failed to converge: {e}. Using zero centrality.")
-        katz_centrality = {node: 0 for node in G.nodes()}
+        katz_centrality = np.zeros(n)
 
     try:
-        pagerank = nx.pagerank(G, alpha=0.85)
+        pagerank_scores = pagerank(A, alpha=0.85, nstart=_warm_start(prev["pagerank"], active))
         logger.info("Computed PageRank")
     except Exception as e:
         logger.error(f"PageRank computation failed: {e}. Using zero centrality.")
-        pagerank = {node: 0 for node in G.nodes()}
+        pagerank_scores = np.zeros(n)
 
-    all_files = [node for node in G.nodes() if node.endswith('.java')]
+    if vectors_path:
+        try:
+            full = {name: np.full(len(nodes), np.nan) for name in prev}
+            full["katz"][active] = katz_centrality
+            full["pagerank"][active] = pagerank_scores
+            np.savez(vectors_path, **full)
+        except OSError as e:
+            logger.error(f"Error saving {vectors_path}: {e}")
+
+    keep = is_file[active]
     results = pd.DataFrame({
-        'file': all_files,
-        'katz_centrality': [katz_centrality.get(f, 0) for f in all_files],
-        'pagerank': [pagerank.get(f, 0) for f in all_files]
+        'file': nodes[active][keep],
+        'katz_centrality': katz_centrality[keep],
+        'pagerank': pagerank_scores[keep]
     })
     results.sort_values('katz_centrality', ascending=False, inplace=True)
 
     try:
-        results.to_csv(OUTPUT_CSV, index=False)
-        logger.info(f"Saved centrality results to {OUTPUT_CSV}")
+        results.to_csv(output_csv, index=False)
+        logger.info(f"Saved centrality results to {output_csv}")
         logger.info("Top 5 high-centrality files:")
         logger.info(f"\n{results.head().to_string()}")
     except IOError as e:
-        logger.error(f"Error saving {OUTPUT_CSV}: {e}")
-
-
-if __name__ == "__main__":
+        logger.error(f"Error saving {output_csv}: {e}")
+    return results
+
+
+def seed_vector(nodes, modules):
+    """Personalization vector spreading the restart mass over files under `modules`.
+
+    Modules are directories relative to a project root, e.g.
+    "app/src/main/java/org/example/sync"; a file is a seed when its path
+    contains the module as a whole path segment run.
+    """
+    needles = [f"/{m.strip('/')}/" for m in modules]
+    seeds = np.array([node.endswith('.java') and any(n in node for n in needles) for node in nodes], dtype=float)
+    if not seeds.any():
+        raise ValueError(f"No Java files found under seed modules {', '.join(modules)}")
+    return seeds
+
+
+def compute_recent_centrality(store, half_lives_days=(), seeds=None, now=None, max_commit_files=None,
+                              output_csv=None):
+    """PageRank of Java files under exponential time decay and/or personalization.
+
+    One column per half-life (in days), named pagerank_<days>d; a half-life
+    of None gives the undecayed, weighted graph as plain "pagerank". All
+    half-lives run as a single batched power iteration. With `seeds` (module
+    directories), the random surfer restarts only at files under those
+    modules, so scores measure relevance to them. Files that no longer exist
+    are dropped from the graph.
+    """
+    half_lives_days = list(half_lives_days) or [None]
+    nodes = np.array(store.nodes, dtype=object)
+    is_file = np.array([node.endswith('.java') for node in nodes], dtype=bool)
+    active = ~is_file | np.array([bool(f) and os.path.exists(node) for node, f in zip(nodes, is_file)])
+    matrices = [graph_adjacency(store, True, max_commit_files,
+                                None if days is None else days * DAY, now)[active][:, active]
+                for days in half_lives_days]
+    personalization = None if not seeds else seed_vector(nodes[active], seeds)
     try:
-        g = Github("")
-        repo = g.get_repo("")
-        local_report_path = ""
-
-        class_to_file = build_class_to_file_mapping(local_report_path)
-
-        # Process commits
-        G = process_commits(g, repo, local_report_path)
+        scores = pagerank_batch(matrices, alpha=0.85, personalization=personalization)
+        logger.info(f"Computed PageRank for {len(half_lives_days)} half-lives"
+                    f"{' seeded on ' + ', '.join(seeds) if seeds else ''}")
+    except ConvergenceError as e:
+        logger.error(f"Recent-activity PageRank failed to converge: {e}. Using zero centrality.")
+        scores = np.zeros((len(half_lives_days), int(active.sum())))
+
+    keep = is_file[active]
+    results = pd.DataFrame({'file': nodes[active][keep]})
+    for days, column in zip(half_lives_days, scores):
+        results['pagerank' if days is None else f'pagerank_{days:g}d'] = column[keep]
+    results.sort_values(results.columns[1], ascending=False, inplace=True)
+
+    if output_csv:
+        try:
+            results.to_csv(output_csv, index=False)
+            logger.info(f"Saved recent-activity centrality to {output_csv}")
+        except IOError as e:
+            logger.error(f"Error saving {output_csv}: {e}")
+    return results
+
+
+def analyze_project(project, root_dir, state_root=STATE_ROOT, output_csv=None, backend="local",
+                    fetcher=None, incremental=False, timings=None, index_workers=4, half_lives_days=(),
+                    seeds=None, weighted=False, max_commit_files=None):
+    """Run the RQ2 pipeline for one project with its state in <state_root>/<project>/.
+
+    The Java index, graph store and centrality vectors of a project never
+    collide with another's, so projects can run side by side, and a later
+    incremental run only ingests new commits and re-parses changed files.
+    Seconds spent per stage are recorded in `timings` when given.
+    `weighted` and `max_commit_files` are passed on to compute_centrality()
+    (the cap also to the recent-activity PageRank). With decay half-lives or
+    seed modules, time-decayed/personalized PageRank is also written to
+    <project>_centrality_recent.csv.
+    """
+    timings = {} if timings is None else timings
+    state_dir = os.path.join(state_root, project)
+    os.makedirs(state_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    index = JavaIndex(os.path.join(state_dir, JAVA_INDEX_JSON)).update(root_dir, max_workers=index_workers)
+    timings["index"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = GraphStore(os.path.join(state_dir, GRAPH_STORE_DIR))
+    process_commits(store, root_dir, backend, fetcher, incremental=incremental)
+    timings["commits"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    add_dependency_edges(store, index)
+    timings["dependencies"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = compute_centrality(store, weighted, max_commit_files, output_csv or f"{project}_centrality.csv",
+                                 vectors_path=os.path.join(state_dir, VECTORS_NPZ))
+    timings["centrality"] = time.perf_counter() - start
+
+    if half_lives_days or seeds:
+        start = time.perf_counter()
+        recent_csv = os.path.splitext(output_csv or f"{project}_centrality.csv")[0] + "_recent.csv"
+        compute_recent_centrality(store, half_lives_days, seeds, max_commit_files=max_commit_files,
+                                  output_csv=recent_csv)
+        timings["recent"] = time.perf_counter() - start
+    return results
 
-        # Add dependency edges
-        G = add_dependency_edges(G, class_to_file, local_report_path)
 
-        # Compute centrality
-        compute_centrality(G)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute Katz centrality and PageRank for a project's Java files")
+    parser.add_argument("root_dir", help="Local clone of the project")
+    parser.add_argument("--project", help="Name for the state directory and output (default: root_dir's name)")
+    parser.add_argument("--state-root", default=STATE_ROOT, help="Directory holding per-project state")
+    parser.add_argument("--output", help="Output CSV (default: <project>_centrality.csv)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Ingest only commits after the last processed head and warm-start centrality")
+    parser.add_argument("--weighted", action="store_true",
+                        help="Weight edges by co-change and authorship counts instead of counting each once")
+    parser.add_argument("--max-commit-files", type=int, metavar="N",
+                        help="Leave commits touching more than N files out of the co-change graph")
+    parser.add_argument("--half-life", type=float, action="append", default=[], metavar="DAYS",
+                        help="Also compute PageRank with co-change/authorship decayed by this half-life; repeatable")
+    parser.add_argument("--seed", action="append", default=[], metavar="MODULE",
+                        help="Personalize that PageRank on files under this directory; repeatable")
+    # "local" reads history from the clone; "api" fetches it from GitHub
+    parser.add_argument("--backend", choices=["local", "api"], default="local")
+    parser.add_argument("--repo", default="", help="owner/name on GitHub, for --backend api")
+    parser.add_argument("--token", default=os.environ.get("GITHUB_TOKEN", ""), help="GitHub token for --backend api")
+    args = parser.parse_args()
 
+    try:
+        project = args.project or os.path.basename(os.path.normpath(args.root_dir))
+        fetcher = GitHubCommitFetcher(args.repo, token=args.token) if args.backend == "api" else None
+        analyze_project(project, args.root_dir, args.state_root, args.output, args.backend, fetcher, args.incremental,
+                        half_lives_days=args.half_life, seeds=args.seed, weighted=args.weighted,
+                        max_commit_files=args.max_commit_files)
         logger.info("Analysis completed successfully")
     except Exception as e:
-        logger.error(f"Main execution failed: {e}")
\ No newline at end of file
+        logger.error(f"Main execution failed: {e}")
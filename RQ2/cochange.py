@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+TOUCHES = "touches"
+
+
+class CoChangeAccumulator:
+    """Records commits in a GraphStore as author->file "touches" edges.
+
+    Each touch carries the commit's ordinal and author timestamp, so the
+    store holds the commit x file incidence rather than every file pair.
+    Files are interned to integer node indices and their existence under
+    root_dir is checked once per path for the whole run; files already in
+    the store are known to exist.
+    """
+
+    def __init__(self, store, root_dir):
+        self.store = store
+        self.root_dir = root_dir
+        self._missing = set()
+
+    def _index(self, rel_path):
+        full_path = os.path.join(self.root_dir, rel_path)
+        idx = self.store.node_index.get(full_path)
+        if idx is None:
+            if full_path in self._missing:
+                return None
+            if not os.path.exists(full_path):
+                self._missing.add(full_path)
+                return None
+            idx = self.store.intern(full_path)
+        return idx
+
+    def add_commit(self, ordinal, author, timestamp, paths):
+        indices = sorted({idx for idx in map(self._index, paths) if idx is not None})
+        if indices:
+            self.store.add_edges(TOUCHES, self.store.intern(author), indices,
+                                 commit=ordinal, time=timestamp or 0)
+
+
+def cochange_matrix(touches, n_nodes, commit_weights=None, max_commit_files=None):
+    """Weighted, symmetric file x file co-change matrix from touch edges.
+
+    With B the commit x file incidence matrix and W a diagonal of per-commit
+    weights (1 by default), co-change is B.T @ W @ B with the diagonal
+    dropped, so repeated co-changes add up and a commit touching k files
+    costs one sparse product. Commits touching more than max_commit_files
+    files get weight 0.
+    """
+    commits, rows = np.unique(touches['commit'], return_inverse=True)
+    B = sp.csr_matrix((np.ones(len(rows)), (rows, touches['dst'])), shape=(len(commits), n_nodes))
+    B.data[:] = 1.0
+    w = np.ones(len(commits)) if commit_weights is None else np.asarray(commit_weights, dtype=float)
+    if max_commit_files is not None:
+        w = np.where(np.diff(B.indptr) > max_commit_files, 0.0, w)
+    C = (B.T @ sp.diags(w) @ B).tocsr()
+    C.setdiag(0)
+    C.eliminate_zeros()
+    return C
+
+
+def decay_weights(times, now, half_life):
+    """Exponential decay 0.5 ** (age / half_life) for epoch-second timestamps."""
+    age = np.maximum(now - np.asarray(times, dtype=float), 0.0)
+    return np.exp2(-age / half_life)
+
+
+def commit_times(touches):
+    """Author timestamp of each distinct commit, in cochange_matrix()'s commit order."""
+    _, first = np.unique(touches['commit'], return_index=True)
+    return touches['time'][first]
+
+
+def author_matrix(touches, n_nodes, weights=None):
+    """Author -> file matrix summing the (optionally per-touch weighted) commits linking them."""
+    w = touches['weight'].astype(float)
+    if weights is not None:
+        w = w * weights
+    return sp.csr_matrix((w, (touches['src'], touches['dst'])), shape=(n_nodes, n_nodes))
@@ -0,0 +1,59 @@
+import logging
+import subprocess
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# One commit as consumed by process_commits(), whichever backend produced it.
+# `files` are repository-relative paths; `timestamp` is the author date (epoch seconds).
+Commit = namedtuple("Commit", ["sha", "author", "timestamp", "files"])
+
+RECORD_SEP = "\x1e"
+FIELD_SEP = "\x1f"
+
+
+def resolve_head(root_dir, rev="HEAD"):
+    """Full SHA that `rev` currently points to in the clone at root_dir."""
+    return subprocess.run(["git", "-C", root_dir, "rev-parse", rev], check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def iter_local_commits(root_dir, skip=0, max_commits=None, rev="HEAD", since=None):
+    """Stream commits from a local clone with `git log --name-only`, newest first.
+
+    With `since`, only commits reachable from `rev` but not from `since` are
+    listed. Merge commits are skipped: their first-parent diff repeats every
+    change of the merged branch and would swamp the co-change graph. Authors
+    are identified by their mailmap-resolved email.
+    """
+    cmd = ["git", "-C", root_dir, "-c", "core.quotePath=false", "log", "--no-merges", "--name-only",
+           f"--format={RECORD_SEP}%H{FIELD_SEP}%aE{FIELD_SEP}%at"]
+    if skip:
+        cmd.append(f"--skip={skip}")
+    if max_commits is not None:
+        cmd.append(f"--max-count={max_commits}")
+    cmd.append(f"{since}..{rev}" if since else rev)
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, encoding="utf-8", errors="replace")
+    try:
+        commit = None
+        for line in proc.stdout:
+            line = line.rstrip("\n")
+            if line.startswith(RECORD_SEP):
+                if commit is not None:
+                    yield commit
+                sha, author, timestamp = line[1:].split(FIELD_SEP)
+                commit = Commit(sha, author, int(timestamp), [])
+            elif line and commit is not None:
+                commit.files.append(line)
+        if commit is not None:
+            yield commit
+        if proc.wait() != 0:
+            raise RuntimeError(f"git log failed in {root_dir}: {proc.stderr.read().strip()}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
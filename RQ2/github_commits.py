@@ -0,0 +1,215 @@
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from git_commits import Commit
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+ETAG_CACHE_DB = "github_etags.sqlite"
+
+
+class TokenBucket:
+    """Paces requests so the quota GitHub reports lasts until its reset time."""
+
+    def __init__(self, rate=5000 / 3600, capacity=50):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def refund(self):
+        """Give back a token for a request GitHub did not count (304 Not Modified)."""
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def update(self, remaining, reset_at):
+        """Spread `remaining` requests evenly over the time left until `reset_at` (epoch seconds)."""
+        with self.lock:
+            window = max(reset_at - time.time(), 1.0)
+            self.rate = max(remaining, 1) / window
+            self.tokens = min(self.tokens, float(remaining))
+
+
+class ETagCache:
+    """SQLite store of response bodies and ETags for conditional GitHub requests."""
+
+    def __init__(self, db_path=ETAG_CACHE_DB):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, etag TEXT, body TEXT NOT NULL, next_url TEXT)"
+            )
+
+    def get(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, body, next_url FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+
+    def put(self, url, etag, body, next_url):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (url, etag, body, next_url) VALUES (?, ?, ?, ?)",
+                (url, etag, json.dumps(body), next_url),
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class GitHubCommitFetcher:
+    """Fetch a repository's commits and their changed files over the REST API.
+
+    The commit listing is paginated in order while per-commit detail requests
+    run on a thread pool sharing one pooled session. Requests are paced by a
+    TokenBucket fed from the X-RateLimit headers, listing pages are revalidated
+    with If-None-Match, and commit details (immutable per SHA) are served from
+    the ETag cache without a request at all on re-runs. `api_url` can point at
+    a local fake server.
+    """
+
+    def __init__(self, repo_name, token="", api_url=GITHUB_API_URL, workers=8,
+                 cache_path=ETAG_CACHE_DB, timeout=30, max_retries=5):
+        self.repo_name = repo_name
+        self.api_url = api_url.rstrip("/")
+        self.workers = workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.bucket = TokenBucket()
+        self.cache = ETagCache(cache_path) if cache_path else None
+        self.session = requests.Session()
+        self.session.headers["Accept"] = "application/vnd.github.v3+json"
+        if token:
+            self.session.headers["Authorization"] = f"token {token}"
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _update_budget(self, response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_at = response.headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset_at is not None:
+            self.bucket.update(int(remaining), int(reset_at))
+
+    def get(self, url, params=None, immutable=False):
+        """GET a JSON resource. Returns (body, next_page_url)."""
+        if not url.startswith("http"):
+            url = self.api_url + url
+        url = requests.Request("GET", url, params=params).prepare().url
+        cached = self.cache.get(url) if self.cache else None
+        if cached is not None and immutable:
+            return cached[1], cached[2]
+        headers = {"If-None-Match": cached[0]} if cached is not None and cached[0] else {}
+
+        for _ in range(self.max_retries):
+            self.bucket.acquire()
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            self._update_budget(response)
+            if response.status_code == 304:
+                self.bucket.refund()
+                return cached[1], cached[2]
+            if response.status_code in (403, 429):
+                retry_after = response.headers.get("Retry-After")
+                if retry_after is not None:
+                    logger.info(f"Secondary rate limit hit. Sleeping for {retry_after} seconds.")
+                    time.sleep(int(retry_after))
+                    continue
+                if response.headers.get("X-RateLimit-Remaining") == "0":
+                    # The bucket now holds no tokens until the reset time
+                    continue
+            response.raise_for_status()
+            body = response.json()
+            next_url = response.links.get("next", {}).get("url")
+            if self.cache and (immutable or response.headers.get("ETag")):
+                self.cache.put(url, response.headers.get("ETag"), body, next_url)
+            return body, next_url
+        raise RuntimeError(f"Giving up on {url} after {self.max_retries} attempts")
+
+    def resolve_head(self, rev=None):
+        """SHA of `rev`, or of the default branch head when rev is None."""
+        params = {"per_page": 1} if rev is None else {"per_page": 1, "sha": rev}
+        page, _ = self.get(f"/repos/{self.repo_name}/commits", params)
+        return page[0]["sha"]
+
+    def iter_listing(self, skip=0, max_commits=None, per_page=100, rev=None, since=None):
+        """Yield commit listing entries newest first, skipping the first `skip`.
+
+        At most max_commits entries are yielded after the skipped ones, as
+        git log --skip --max-count does. The listing starts at `rev` (default
+        branch head by default) and stops before the commit `since`, which
+        must be on the listed history.
+        """
+        url = f"/repos/{self.repo_name}/commits"
+        params = {"per_page": per_page, "page": skip // per_page + 1}
+        if rev is not None:
+            params["sha"] = rev
+        offset = skip % per_page
+        yielded = 0
+        while url and (max_commits is None or yielded < max_commits):
+            page, url = self.get(url, params)
+            params = None  # next links already carry the query
+            for item in page[offset:]:
+                if (max_commits is not None and yielded >= max_commits) or item["sha"] == since:
+                    return
+                yield item
+                yielded += 1
+            offset = 0
+
+    def commit_details(self, sha):
+        body, next_url = self.get(f"/repos/{self.repo_name}/commits/{sha}", immutable=True)
+        files = [f["filename"] for f in body.get("files", [])]
+        while next_url:
+            page, next_url = self.get(next_url, immutable=True)
+            files.extend(f["filename"] for f in page.get("files", []))
+        login = (body.get("author") or {}).get("login")
+        if login is None:
+            return Commit(sha, None, None, [])
+        date = body["commit"]["author"]["date"].replace("Z", "+00:00")
+        return Commit(sha, login, int(datetime.fromisoformat(date).timestamp()), files)
+
+    def iter_commits(self, skip=0, max_commits=None, rev=None, since=None):
+        """Yield Commit records in listing order with details fetched concurrently."""
+        listing = self.iter_listing(skip, max_commits, rev=rev, since=since)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            window = deque(pool.submit(self.commit_details, item["sha"])
+                           for item in islice(listing, 2 * self.workers))
+            while window:
+                commit = window.popleft().result()
+                for item in islice(listing, 1):
+                    window.append(pool.submit(self.commit_details, item["sha"]))
+                yield commit
+
+    def close(self):
+        self.session.close()
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,116 @@
+import os
+import json
+from collections import defaultdict
+
+import numpy as np
+
+EDGE_DTYPE = np.dtype([('src', '<i4'), ('dst', '<i4'), ('weight', '<f4'), ('commit', '<i4'), ('time', '<i8')])
+NODES_TXT = "nodes.txt"
+META_JSON = "meta.json"
+
+
+class GraphStore:
+    """Integer-indexed graph on disk: an interned node table plus append-only edge layers.
+
+    nodes.txt lists node names in index order and each layer is a flat array
+    of EDGE_DTYPE records in <layer>.edges, loaded with np.memmap instead of
+    being unpickled. checkpoint() appends only what was added since the last
+    one and then atomically replaces meta.json with the committed lengths and
+    the caller's resume state; bytes past those lengths, left by an
+    interrupted checkpoint, are cut off when the store is next opened.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta = self._read_meta()
+        self.state = meta.get("state", {})
+        self.layer_sizes = meta.get("layers", {})
+        self._nodes_bytes = meta.get("nodes_bytes", 0)
+        self._truncate(NODES_TXT, self._nodes_bytes)
+        for layer, size in self.layer_sizes.items():
+            self._truncate(f"{layer}.edges", size * EDGE_DTYPE.itemsize)
+
+        with open(self._file(NODES_TXT), encoding="utf-8") as f:
+            self.nodes = f.read().splitlines()
+        self.node_index = {name: i for i, name in enumerate(self.nodes)}
+        self._committed_nodes = len(self.nodes)
+        self._pending = defaultdict(list)
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _read_meta(self):
+        try:
+            with open(self._file(META_JSON), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _truncate(self, name, size):
+        with open(self._file(name), "ab") as f:
+            if f.tell() > size:
+                f.truncate(size)
+
+    @property
+    def n_nodes(self):
+        return len(self.nodes)
+
+    def intern(self, name):
+        idx = self.node_index.get(name)
+        if idx is None:
+            idx = len(self.nodes)
+            self.nodes.append(name)
+            self.node_index[name] = idx
+        return idx
+
+    def add_edges(self, layer, src, dst, weight=1.0, commit=-1, time=0):
+        dst = np.asarray(dst, dtype='<i4')
+        records = np.empty(len(dst), dtype=EDGE_DTYPE)
+        records['src'] = src
+        records['dst'] = dst
+        records['weight'] = weight
+        records['commit'] = commit
+        records['time'] = time
+        self._pending[layer].append(records)
+
+    def edges(self, layer):
+        """All edges of a layer: the committed part memory-mapped, plus anything pending."""
+        size = self.layer_sizes.get(layer, 0)
+        parts = []
+        if size:
+            parts.append(np.memmap(self._file(f"{layer}.edges"), dtype=EDGE_DTYPE, mode='r', shape=(size,)))
+        parts.extend(self._pending.get(layer, []))
+        if not parts:
+            return np.empty(0, dtype=EDGE_DTYPE)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def reset_layer(self, layer):
+        self._pending.pop(layer, None)
+        self.layer_sizes[layer] = 0
+        self._write_meta()
+        self._truncate(f"{layer}.edges", 0)
+
+    def checkpoint(self, **state):
+        """Append new nodes and edges, then commit them together with `state`."""
+        new_nodes = self.nodes[self._committed_nodes:]
+        if new_nodes:
+            data = "".join(name + "\n" for name in new_nodes).encode("utf-8")
+            with open(self._file(NODES_TXT), "ab") as f:
+                f.write(data)
+            self._nodes_bytes += len(data)
+            self._committed_nodes = len(self.nodes)
+        for layer, chunks in self._pending.items():
+            with open(self._file(f"{layer}.edges"), "ab") as f:
+                for records in chunks:
+                    f.write(records.tobytes())
+                    self.layer_sizes[layer] = self.layer_sizes.get(layer, 0) + len(records)
+        self._pending.clear()
+        self.state.update(state)
+        self._write_meta()
+
+    def _write_meta(self):
+        tmp = self._file(META_JSON + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"nodes_bytes": self._nodes_bytes, "layers": self.layer_sizes, "state": self.state}, f)
+        os.replace(tmp, self._file(META_JSON))
@@ -0,0 +1,143 @@
+import os
+import json
+import logging
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+SCORES_DIR = "readability_scores"
+MANIFEST_JSON = "manifest.json"
+CENTRALITY = "centrality"
+READABILITY = "readability"
+PARTITIONING = ds.partitioning(pa.schema([("group", pa.string()), ("project", pa.string())]), flavor="hive")
+
+
+def canonical_keys(paths, group, project):
+    """Repo-relative keys ("src/.../Foo.java") for the paths of one project's files.
+
+    Absolute paths from any machine or platform are cut after their
+    <group>/<project>/ segment, or failing that after the first /<project>/
+    segment; relative paths are taken to be relative to the project root.
+    Absolute paths with neither segment get NaN.
+    """
+    paths = pd.Series(paths, dtype=object).str.replace('\\', '/', regex=False)
+    keys = pd.Series(np.nan, index=paths.index, dtype=object)
+    for marker in (f'/{group}/{project}/', f'/{project}/'):
+        missing = keys.isna()
+        if not missing.any():
+            break
+        parts = ('/' + paths[missing]).str.partition(marker)
+        keys[missing] = parts[2].where(parts[1] == marker)
+    relative = keys.isna() & ~paths.str.match(r'(?:/|[A-Za-z]:/)')
+    keys[relative] = paths[relative].str.replace(r'^(?:\./)+', '', regex=True)
+    return keys
+
+
+def source_csvs(base_path, groups):
+    """(table, group, project) -> CSV path for every centrality and readability CSV of the groups."""
+    sources = {}
+    for group in groups:
+        group_path = Path(base_path) / group
+        for csv in group_path.glob('*_centrality.csv'):
+            sources[(CENTRALITY, group, csv.stem[:-len('_centrality')])] = csv
+        for csv in (group_path / SCORES_DIR).glob('*_readability.csv'):
+            sources[(READABILITY, group, csv.stem[:-len('_readability')])] = csv
+    return sources
+
+
+class GroupDataset:
+    """Centrality and readability CSVs of all groups as one Parquet dataset.
+
+    Each CSV becomes a partition <table>/group=<g>/project=<p>/part.parquet
+    with a canonical_keys() "key" column added, so the join key is computed
+    once at ingest. sync() re-ingests only CSVs whose mtime or size changed
+    since the manifest recorded them and drops partitions of deleted CSVs.
+    load() reads through pyarrow.dataset, so filters on group, project or
+    any column are pushed down and only matching partitions are read.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.manifest = {}
+        self._datasets = {}
+        manifest_path = self.root / MANIFEST_JSON
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, 'r') as f:
+                    self.manifest = json.load(f)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Could not load {manifest_path}: {e}. Re-ingesting all CSVs.")
+
+    def _partition(self, table, group, project):
+        return self.root / table / f"group={quote(group, safe='')}" / f"project={quote(project, safe='')}"
+
+    def sync(self, base_path, groups):
+        """Bring the dataset up to date with the CSVs under base_path; returns the number re-ingested."""
+        sources = source_csvs(base_path, groups)
+        wanted = {"/".join(source): source for source in sources}
+        changed = 0
+        failed = []
+        for name, source in wanted.items():
+            st = os.stat(sources[source])
+            signature = [st.st_mtime_ns, st.st_size]
+            if self.manifest.get(name) != signature:
+                if self._ingest(*source, sources[source]):
+                    self.manifest[name] = signature
+                    changed += 1
+                else:
+                    failed.append(name)
+        # Unreadable files contribute no rows, not those of an earlier version
+        removed = [name for name in self.manifest
+                   if (name not in wanted or name in failed) and name.split("/")[1] in groups]
+        for name in removed:
+            self._drop(name)
+        if changed or removed:
+            self._datasets.clear()
+            tmp = self.root / (MANIFEST_JSON + ".tmp")
+            with open(tmp, 'w') as f:
+                json.dump(self.manifest, f)
+            os.replace(tmp, self.root / MANIFEST_JSON)
+        logger.info(f"Dataset sync: {changed} CSVs ingested, {len(failed)} unreadable, {len(removed)} removed, "
+                    f"{len(wanted) - changed - len(failed)} unchanged")
+        return changed
+
+    def _drop(self, name):
+        part = self._partition(*name.split("/"))
+        if (part / "part.parquet").exists():
+            os.remove(part / "part.parquet")
+        del self.manifest[name]
+
+    def _ingest(self, table, group, project, csv):
+        """Write one CSV to its partition; returns False (and logs why) when it cannot be read."""
+        path_column = 'file' if table == CENTRALITY else 'file_name'
+        try:
+            df = pd.read_csv(csv)
+            df['key'] = canonical_keys(df[path_column], group, project).astype('string')
+        except Exception as e:
+            logger.error(f"Error reading {table} file for {project}: {e}")
+            return False
+        part = self._partition(table, group, project)
+        part.mkdir(parents=True, exist_ok=True)
+        tmp = part / "part.parquet.tmp"
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp)
+        os.replace(tmp, part / "part.parquet")
+        return True
+
+    def load(self, table, columns=None, filter=None):
+        """Rows of a table as a DataFrame; `filter` is a pyarrow.dataset expression.
+
+        A table nothing was ingested into yet gives an empty frame with the
+        requested columns.
+        """
+        if not (self.root / table).is_dir():
+            return pd.DataFrame(columns=columns or [])
+        if table not in self._datasets:
+            self._datasets[table] = ds.dataset(self.root / table, format="parquet", partitioning=PARTITIONING)
+        return self._datasets[table].to_table(columns=columns, filter=filter).to_pandas()
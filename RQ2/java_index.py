@@ -0,0 +1,139 @@
+import os
+import re
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+INDEX_JSON = "java_index.json"
+INDEX_VERSION = 2
+
+# Comments and string/char literals, blanked before scanning so braces and
+# keywords inside them are ignored
+NOISE_RE = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'', re.DOTALL)
+PACKAGE_RE = re.compile(r'^\s*package\s+([\w\.]+)\s*;', re.MULTILINE)
+# Type declarations (not `Foo.class` literals) and braces, to track nesting
+TOKEN_RE = re.compile(
+    r'(?<![\w.$])(?:class|interface|enum|record|@interface)\s+(?P<type>\w+)|(?P<open>\{)|(?P<close>\})'
+)
+IMPORT_RE = re.compile(r'^\s*import\s+(static\s+)?([\w\.]+(?:\s*\.\s*\*)?)\s*;', re.MULTILINE)
+REFERENCE_RE = re.compile(r'\b[A-Z]\w*')
+
+
+def _blank(match):
+    return re.sub(r'[^\n]', ' ', match.group(0))
+
+
+def parse_java_file(file_path):
+    """Extract package, declared types, imports and referenced type names from one Java file.
+
+    Types are qualified within the package, so a nested class is recorded as
+    "Outer.Inner". Imports keep their form: "a.b.C", "a.b.*", "static a.b.C.m".
+    References are the capitalized identifiers in the code, used to resolve
+    same-package and wildcard imports to the types actually used.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except (IOError, UnicodeDecodeError) as e:
+        logger.error(f"Error reading {file_path}: {e}")
+        return {"package": "", "types": [], "imports": [], "references": []}
+    code = NOISE_RE.sub(_blank, content)
+    package_match = PACKAGE_RE.search(code)
+
+    types = []
+    stack = []  # (qualified name, brace depth of its body)
+    pending = None
+    depth = 0
+    for m in TOKEN_RE.finditer(code):
+        if m.group('type'):
+            pending = m.group('type')
+        elif m.group('open'):
+            depth += 1
+            if pending is not None:
+                name = f"{stack[-1][0]}.{pending}" if stack else pending
+                stack.append((name, depth))
+                types.append(name)
+                pending = None
+        else:
+            if stack and stack[-1][1] == depth:
+                stack.pop()
+            depth -= 1
+
+    imports = [("static " if is_static else "") + re.sub(r'\s+', '', name)
+               for is_static, name in IMPORT_RE.findall(code)]
+    return {
+        "package": package_match.group(1) if package_match else "",
+        "types": types,
+        "imports": imports,
+        "references": sorted(set(REFERENCE_RE.findall(code))),
+    }
+
+
+class JavaIndex:
+    """Per-file package, types and imports, persisted and keyed by path, mtime and size.
+
+    update() walks the tree once and re-parses, in parallel, only files that
+    are new or whose mtime or size changed; both the class-to-file mapping
+    and the dependency pass read from the index instead of reopening files.
+    `generation` increases whenever an update changes the index, so
+    consumers can tell whether what they derived from it is stale.
+    """
+
+    def __init__(self, path=INDEX_JSON):
+        self.path = path
+        self.files = {}
+        self.generation = 0
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    self.files = data["files"]
+                    self.generation = data.get("generation", 0)
+                    logger.info(f"Loaded Java index with {len(self.files)} files from {path}")
+                else:
+                    logger.info(f"Java index format changed, rebuilding {path}")
+            except (json.JSONDecodeError, KeyError) as e:
+                logger.warning(f"Could not load {path}: {e}. Rebuilding index.")
+
+    def update(self, root_dir, max_workers=4):
+        prefix = os.path.join(root_dir, '')
+        seen = {}
+        for subdir, _, files in os.walk(root_dir):
+            for file in files:
+                if file.endswith('.java'):
+                    file_path = os.path.join(subdir, file)
+                    try:
+                        st = os.stat(file_path)
+                    except OSError:
+                        continue
+                    seen[file_path] = (st.st_mtime_ns, st.st_size)
+
+        stale = [p for p, (mtime, size) in seen.items()
+                 if (entry := self.files.get(p)) is None or entry["mtime_ns"] != mtime or entry["size"] != size]
+        removed = [p for p in self.files if p.startswith(prefix) and p not in seen]
+        for p in removed:
+            del self.files[p]
+        logger.info(f"Indexing {len(stale)} of {len(seen)} Java files ({len(removed)} removed)")
+
+        if stale:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for file_path, record in zip(stale, executor.map(parse_java_file, stale, chunksize=64)):
+                    mtime, size = seen[file_path]
+                    self.files[file_path] = dict(record, mtime_ns=mtime, size=size)
+        if stale or removed:
+            self.generation += 1
+            self.save()
+        return self
+
+    def save(self):
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, 'w') as f:
+                json.dump({"version": INDEX_VERSION, "generation": self.generation, "files": self.files}, f)
+            os.replace(tmp, self.path)
+            logger.info(f"Saved Java index to {self.path}")
+        except IOError as e:
+            logger.error(f"Error saving {self.path}: {e}")
@@ -2,7 +2,10 @@ import os
 from pathlib import Path
 import pandas as pd
 import numpy as np
+import pyarrow.dataset as ds
 from scipy.stats import norm
+from group_dataset import CENTRALITY, READABILITY, GroupDataset
+from central_sweep import METRICS, THRESHOLDS, sweep
 
 # Define the base path
 base_path = Path('/Users/elnurseyidov/Desktop/Projects-Centrality')
@@ -10,63 +13,78 @@ base_path = Path('/Users/elnurseyidov/Desktop/Projects-Centrality')
 # Define the groups
 groups = ['Industry-Backed', 'Community-Driven']
 
+# Selected files without a unique readability row, written to this CSV
+MATCH_REPORT_CSV = base_path / 'centrality_readability_issues.csv'
+# Parquet copy of all centrality/readability CSVs, refreshed when they change
+DATASET_DIR = base_path / 'dataset'
+# Group statistics and z-tests for every threshold x metric in central_sweep
+SWEEP_CSV = base_path / 'central_sweep.csv'
+
+
+def match_files(selected_df, readability_df, group, project):
+    """Readability rows of the selected centrality files, joined on canonical keys.
+
+    Both frames carry the "key" column added by GroupDataset. Returns
+    (matched rows, issues), where issues lists selected files that have no
+    key, match no readability row, or match several.
+    """
+    selected = selected_df[['file', 'key']].rename(columns={'file': 'centrality_file'})
+    readability = readability_df.assign(row=np.arange(len(readability_df)))
+    matched = selected.dropna(subset=['key']).merge(readability.dropna(subset=['key']), on='key')
+
+    candidates = matched.groupby('centrality_file')['file_name'].agg(['size', ';'.join])
+    candidates.columns = ['matches', 'candidates']
+    issues = selected.join(candidates, on='centrality_file')
+    issues['matches'] = issues['matches'].fillna(0).astype(int)
+    issues['status'] = np.select(
+        [issues['key'].isna(), issues['matches'] == 0, issues['matches'] > 1],
+        ['no key', 'unmatched', 'ambiguous'], default='')
+    issues = issues[issues['status'] != ''].assign(group=group, project=project)
+
+    # A readability row counts once even if several selected files map to it
+    matched_rows = readability_df.iloc[np.unique(matched['row'])]
+    return matched_rows, issues[['group', 'project', 'centrality_file', 'status', 'matches', 'candidates']]
+
+
+dataset = GroupDataset(DATASET_DIR)
+dataset.sync(base_path, groups)
+
 # Store group statistics for z-test
 group_stats = {}
+all_issues = []
 
 for group in groups:
     print("---------------------------------------------------------------------------------------------------------------")
     print(group)
-    group_path = base_path / group
-    readability_scores_path = group_path / 'readability_scores'
+    in_group = ds.field('group') == group
 
     # Initialize accumulators for weighted mean and variance
     total_weighted_sum = 0
     total_central_files = 0
     total_variance_sum = 0
 
-    # Get list of centrality CSVs
-    centrality_csvs = list(group_path.glob('*_centrality.csv'))
-
-    for centrality_csv in centrality_csvs:
-        project_name = centrality_csv.stem.replace('_centrality', '')
-        centrality_file = centrality_csv
-        readability_file = readability_scores_path / f"{project_name}_readability.csv"
+    # Read the group's projects from the dataset, reading only the needed columns
+    centrality = dict(tuple(dataset.load(CENTRALITY, ['project', 'file', 'key', 'pagerank'], in_group)
+                            .groupby('project')))
+    readability = dict(tuple(dataset.load(READABILITY, ['project', 'file_name', 'key', 'score'], in_group)
+                             .groupby('project')))
 
-        if not readability_file.exists():
+    for project_name, centrality_df in centrality.items():
+        readability_df = readability.get(project_name)
+        if readability_df is None:
             print(f"Readability file not found for {project_name}")
             continue
 
-        # Read centrality CSV
-        try:
-            centrality_df = pd.read_csv(centrality_file)
-        except Exception as e:
-            print(f"Error reading centrality file for {project_name}: {e}")
-            continue
-
         # Select top 10% by pagerank
         N = len(centrality_df)
         top_N = int(np.ceil(N * 0.1))
-        selected_files = centrality_df.nlargest(top_N, 'pagerank')['file'].tolist()
-
-        # Extract relative paths: everything after group/
-        selected_relative = []
-        for path in selected_files:
-            if group + '/' in path:
-                rel = path.split(group + '/', 1)[1]
-                selected_relative.append(rel)
-            else:
-                print(f"Path {path} does not contain {group}/")
-
-        # Read readability CSV
-        try:
-            readability_df = pd.read_csv(readability_file)
-        except Exception as e:
-            print(f"Error reading readability file for {project_name}: {e}")
-            continue
+        selected = centrality_df.nlargest(top_N, 'pagerank')
 
-        # Filter readability_df where file_name ends with any of selected_relative
-        matching_files = readability_df[
-            readability_df['file_name'].apply(lambda x: any(x.endswith(rel) for rel in selected_relative))]
+        # Join selected files to readability rows on repo-relative keys
+        matching_files, issues = match_files(selected, readability_df, group, project_name)
+        all_issues.append(issues)
+        for status, count in issues['status'].value_counts().items():
+            print(f"{project_name}: {count} selected files {status}")
 
         if matching_files.empty:
             print(f"No matching files found for {project_name}")
@@ -86,7 +104,7 @@ for group in groups:
 
         print(
             f"Processed {project_name}, mean: {mean_score}, median: {median_score}, std: {std_score}, "
-            f"selected {len(selected_relative)} files, found {len(matching_files)} matching")
+            f"selected {len(selected)} files, found {len(matching_files)} matching")
 
     # Calculate and print group-level statistics
     if total_central_files > 0:
@@ -106,6 +124,11 @@ for group in groups:
         print(f"No central files with readability scores found for {group}")
         group_stats[group] = None
 
+if all_issues:
+    issues = pd.concat(all_issues, ignore_index=True)
+    issues.to_csv(MATCH_REPORT_CSV, index=False)
+    print(f"Wrote {len(issues)} unmatched/ambiguous selected files to {MATCH_REPORT_CSV}")
+
 # Perform z-test if both groups have valid stats
 if group_stats.get('Industry-Backed') and group_stats.get('Community-Driven'):
     mean1 = group_stats['Industry-Backed']['weighted_mean']
@@ -122,4 +145,11 @@ if group_stats.get('Industry-Backed') and group_stats.get('Community-Driven'):
     print(f"Z-statistic: {z_stat:.2f}")
     print(f"P-value: {p_value:.6e}")
 else:
-    print("Cannot perform z-test: missing data for one or both groups")
\ No newline at end of file
+    print("Cannot perform z-test: missing data for one or both groups")
+
+# Same analysis for every top-k threshold x centrality metric
+_, sweep_table = sweep(dataset, groups, THRESHOLDS, METRICS)
+sweep_table.to_csv(SWEEP_CSV, index=False)
+print("---------------------------------------------------------------------------------------------------------------")
+print(f"Threshold x metric sweep (saved to {SWEEP_CSV})")
+print(sweep_table.to_string(index=False))
@@ -0,0 +1,135 @@
+import os
+import time
+import logging
+import argparse
+import resource
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from centrality_network import analyze_project
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = ".centrality_state"
+SCORES_DIR = "readability_scores"
+TIMINGS_CSV = "centrality_timings.csv"
+STAGES = ["index", "commits", "dependencies", "centrality", "recent"]
+
+
+def list_projects(group_dir):
+    """Project checkouts directly under a group dir such as Industry-Backed/."""
+    return sorted(
+        d for d in os.listdir(group_dir)
+        if os.path.isdir(os.path.join(group_dir, d)) and not d.startswith(".") and d != SCORES_DIR
+    )
+
+
+def project_size(root_dir):
+    """Number of commits in the clone, which drives ingestion and graph size."""
+    try:
+        out = subprocess.run(["git", "-C", root_dir, "rev-list", "--count", "--no-merges", "HEAD"],
+                             check=True, capture_output=True, text=True).stdout
+        return int(out)
+    except (subprocess.CalledProcessError, ValueError, OSError):
+        return 0
+
+
+def _limit_memory(max_memory):
+    if max_memory:
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+
+
+def run_project(project, root_dir, state_root, output_csv, incremental, index_workers, half_lives_days=(), seeds=None,
+                weighted=False, max_commit_files=None):
+    """Worker entry point: run one project and report its status and stage timings."""
+    timings = {}
+    start = time.perf_counter()
+    try:
+        results = analyze_project(project, root_dir, state_root, output_csv,
+                                  incremental=incremental, timings=timings, index_workers=index_workers,
+                                  half_lives_days=half_lives_days, seeds=seeds, weighted=weighted,
+                                  max_commit_files=max_commit_files)
+        status, files = "ok", len(results)
+    except MemoryError:
+        status, files = "out of memory", 0
+    except Exception as e:
+        status, files = f"failed: {e}", 0
+    return dict(project=project, status=status, files=files, **timings, total=time.perf_counter() - start)
+
+
+def run_group(group_dir, projects=None, workers=2, max_memory=None, incremental=False,
+              state_root=None, index_workers=1, half_lives_days=(), seeds=None, weighted=False,
+              max_commit_files=None):
+    """Compute centrality for many projects of a group dir on a process pool.
+
+    Each project writes <group_dir>/<project>_centrality.csv, next to the
+    readability_scores/ dir process_centrality_readability.py pairs it
+    with, and keeps its state in <state_root>/<project>/. Projects are
+    submitted largest first (by commit count) so the longest ones do not
+    start last. Every project runs in a fresh worker process whose address
+    space is capped at max_memory bytes, so a huge repository fails alone
+    instead of taking the machine down, and its memory is returned as soon
+    as it finishes. Half-lives, seeds, `weighted` and `max_commit_files` are
+    passed on to analyze_project().
+    """
+    state_root = state_root or os.path.join(group_dir, STATE_DIR)
+    projects = projects or list_projects(group_dir)
+    sizes = {p: project_size(os.path.join(group_dir, p)) for p in projects}
+    order = sorted(projects, key=sizes.get, reverse=True)
+    logger.info(f"Running {len(order)} projects on {workers} workers, largest first")
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1,
+                             initializer=_limit_memory, initargs=(max_memory,)) as executor:
+        futures = {
+            executor.submit(run_project, p, os.path.join(group_dir, p), state_root,
+                            os.path.join(group_dir, f"{p}_centrality.csv"), incremental, index_workers,
+                            half_lives_days, seeds, weighted, max_commit_files): p
+            for p in order
+        }
+        for future in as_completed(futures):
+            project = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                # The worker itself died, e.g. killed for exceeding the memory cap
+                row = dict(project=project, status=f"worker died: {e}", files=0)
+            row["n_commits"] = sizes[project]
+            rows.append(row)
+            logger.info(f"{project}: {row['status']} in {row.get('total', 0):.1f}s")
+
+    summary = pd.DataFrame(rows).reindex(
+        columns=["project", "status", "n_commits", "files", *STAGES, "total"]
+    ).sort_values("total", ascending=False)
+    summary.to_csv(os.path.join(group_dir, TIMINGS_CSV), index=False)
+    logger.info(f"Timing summary (seconds):\n{summary.to_string(index=False, float_format='%.1f')}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute RQ2 centrality for every project of a group directory")
+    parser.add_argument("group_dir", help="Directory of project clones, e.g. Industry-Backed/")
+    parser.add_argument("--projects", nargs="+", help="Only run these projects")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Projects processed at once")
+    parser.add_argument("--max-memory-gb", type=float, help="Address space cap per worker")
+    parser.add_argument("--index-workers", type=int, default=1,
+                        help="Parser processes per project for the Java index")
+    parser.add_argument("--state-root", help=f"Per-project state (default: <group_dir>/{STATE_DIR})")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Ingest only commits after each project's last processed head")
+    parser.add_argument("--weighted", action="store_true",
+                        help="Weight edges by co-change and authorship counts instead of counting each once")
+    parser.add_argument("--max-commit-files", type=int, metavar="N",
+                        help="Leave commits touching more than N files out of the co-change graph")
+    parser.add_argument("--half-life", type=float, action="append", default=[], metavar="DAYS",
+                        help="Also compute time-decayed PageRank with this half-life; repeatable")
+    parser.add_argument("--seed", action="append", default=[], metavar="MODULE",
+                        help="Personalize that PageRank on files under this directory; repeatable")
+    args = parser.parse_args()
+
+    max_memory = int(args.max_memory_gb * 2 ** 30) if args.max_memory_gb else None
+    run_group(args.group_dir, args.projects, args.workers, max_memory, args.incremental,
+              args.state_root, args.index_workers, args.half_life, args.seed, args.weighted, args.max_commit_files)
@@ -0,0 +1,151 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import pytest
+
+from github_commits import GitHubCommitFetcher, TokenBucket
+
+REPO = "octo/app"
+
+
+def sha(i):
+    return f"{i:040x}"
+
+
+class FakeGitHub(ThreadingHTTPServer):
+    """Local stand-in for the commits endpoints of the GitHub REST API.
+
+    History is commits 0..n-1, newest first. Listing pages carry Link
+    headers and ETags and answer a matching If-None-Match with 304; a path
+    in `throttled` gets one 403 with Retry-After first. 200 responses grant
+    a large X-RateLimit budget so the fetcher does not pace the tests.
+    Every request is recorded in `requests` as (path, If-None-Match).
+    """
+
+    def __init__(self, n_commits):
+        super().__init__(("127.0.0.1", 0), FakeHandler)
+        self.n_commits = n_commits
+        self.requests = []
+        self.throttled = set()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, body, etag, headers=()):
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.send_header("X-RateLimit-Remaining", "100000")
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 10))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        server = self.server
+        server.requests.append((url.path, self.headers.get("If-None-Match")))
+        if url.path in server.throttled:
+            server.throttled.discard(url.path)
+            self.send_response(403)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        prefix = f"/repos/{REPO}/commits"
+        if url.path == prefix:
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            per_page, page = int(query.get("per_page", 30)), int(query.get("page", 1))
+            first = int(query["sha"], 16) if "sha" in query else 0
+            start = first + (page - 1) * per_page
+            end = min(start + per_page, server.n_commits)
+            headers = []
+            if end < server.n_commits:
+                next_query = urlencode(dict(query, page=page + 1))
+                headers.append(("Link", f'<{server.url}{prefix}?{next_query}>; rel="next"'))
+            self.send_json([{"sha": sha(i)} for i in range(start, end)], f'"{url.query}"', headers)
+        elif url.path.startswith(prefix + "/"):
+            i = int(url.path[len(prefix) + 1:], 16)
+            self.send_json({"sha": sha(i), "author": {"login": f"dev{i % 3}"},
+                            "commit": {"author": {"date": f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z"}},
+                            "files": [{"filename": f"src/F{i}.java"}, {"filename": "README.md"}]},
+                           f'"commit-{i}"')
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+
+@pytest.fixture
+def github():
+    server = FakeGitHub(1050)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fetcher(github, tmp_path):
+    fetcher = GitHubCommitFetcher(REPO, api_url=github.url, workers=4, cache_path=str(tmp_path / "etags.sqlite"))
+    yield fetcher
+    fetcher.close()
+
+
+def test_listing_paginates_with_skip_max_and_since(fetcher):
+    listed = [item["sha"] for item in fetcher.iter_listing(skip=130, max_commits=100, per_page=50)]
+    assert listed == [sha(i) for i in range(130, 230)]
+    assert len(list(fetcher.iter_listing(since=sha(20)))) == 20
+    assert [item["sha"] for item in fetcher.iter_listing(rev=sha(1040))] == [sha(i) for i in range(1040, 1050)]
+    assert fetcher.resolve_head() == sha(0)
+
+
+def test_iter_commits_has_no_default_limit(fetcher):
+    commits = list(fetcher.iter_commits())
+    assert [c.sha for c in commits] == [sha(i) for i in range(1050)]
+    assert commits[61].author == "dev1" and commits[61].files == ["src/F61.java", "README.md"]
+    assert commits[61].timestamp - commits[0].timestamp == 61
+
+
+def test_not_modified_refunds_token(github, fetcher):
+    first = fetcher.get(f"/repos/{REPO}/commits", {"per_page": 10})
+    fetcher.bucket = TokenBucket(rate=1e-9, capacity=50)
+    assert fetcher.get(f"/repos/{REPO}/commits", {"per_page": 10}) == first
+    assert github.requests[-1][1] is not None
+    assert fetcher.bucket.tokens == pytest.approx(50)
+
+
+def test_retry_after_on_forbidden(github, fetcher):
+    path = f"/repos/{REPO}/commits/{sha(5)}"
+    github.throttled.add(path)
+    assert fetcher.commit_details(sha(5)).files == ["src/F5.java", "README.md"]
+    assert [p for p, _ in github.requests].count(path) == 2
+
+
+def test_commit_details_served_from_cache(github, fetcher, tmp_path):
+    path = f"/repos/{REPO}/commits/{sha(7)}"
+    commit = fetcher.commit_details(sha(7))
+    rerun = GitHubCommitFetcher(REPO, api_url=github.url, cache_path=str(tmp_path / "etags.sqlite"))
+    try:
+        assert rerun.commit_details(sha(7)) == commit
+    finally:
+        rerun.close()
+    assert [p for p, _ in github.requests].count(path) == 1
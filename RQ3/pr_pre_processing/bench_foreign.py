@@ -0,0 +1,53 @@
+import time
+import random
+import argparse
+
+import numpy as np
+
+from stages import non_latin_letter_ratio, non_latin_ratios, script_table
+
+# Word pools mixed into synthetic PR bodies: mostly English, some other scripts
+WORDS = ("fix the build when the cache is empty and add tests for parser errors "
+         "update docs bump version refactor handler crash on startup").split()
+FOREIGN = ["修复", "缓存", "构建", "ошибка", "исправить", "テスト", "수정", "ελέγχου", "تحديث", "café", "naïve"]
+OTHER = ["🙂", "v1.2.3", "#1234", "src/main.py", "`x = 1`", "->", "42"]
+
+
+def make_bodies(n_rows, words_per_body, seed=0):
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(n_rows):
+        foreign_share = rng.choice((0.0, 0.0, 0.0, 0.05, 0.3, 0.9))
+        bodies.append(' '.join(rng.choice(FOREIGN) if rng.random() < foreign_share
+                               else rng.choice(OTHER) if rng.random() < 0.1 else rng.choice(WORDS)
+                               for _ in range(rng.randint(1, 2 * words_per_body))))
+    return bodies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the vectorized non-Latin letter ratio against the per-character one.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="PR bodies to classify")
+    parser.add_argument("--words", type=int, default=40, help="average words per body")
+    parser.add_argument("--reference-rows", type=int, default=100_000,
+                        help="bodies timed with non_latin_letter_ratio() and compared (its rate is extrapolated)")
+    args = parser.parse_args()
+
+    bodies = make_bodies(args.rows, args.words)
+    chars = sum(map(len, bodies))
+    start = time.perf_counter()
+    script_table()
+    table_t = time.perf_counter() - start
+    start = time.perf_counter()
+    ratios = non_latin_ratios(bodies)
+    fast_t = time.perf_counter() - start
+
+    sample = bodies[:args.reference_rows]
+    start = time.perf_counter()
+    reference = np.array([non_latin_letter_ratio(body) for body in sample], dtype=float)
+    ref_t = (time.perf_counter() - start) * len(bodies) / max(len(sample), 1)
+    assert (ratios[:len(sample)] == reference).all()
+
+    print(f"{len(bodies)} bodies, {chars / 2 ** 20:.1f}M code points | script table {table_t:.2f}s"
+          f" | vectorized {fast_t:.2f}s | per-character {ref_t:.1f}s"
+          f"{' (extrapolated)' if len(sample) < len(bodies) else ''} | speedup {ref_t / fast_t:.0f}x")
@@ -0,0 +1,194 @@
+import io
+import os
+import json
+import hashlib
+import argparse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from stages import DEFAULT_ORDER, STAGES
+from stage_cache import CACHE_DIR, StageCache, stage_keys
+
+
+def build_stages(order=DEFAULT_ORDER, config=None):
+    """Stages in the given order, with parameters overridden from {stage: {param: value}}."""
+    config = config or {}
+    unknown = (set(order) | set(config)) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+    return [STAGES[name].configure(**config.get(name, {})) for name in order]
+
+
+def run_stages(df, stages, name="", after_stage=None):
+    """Apply stages in order to one project's PRs.
+
+    Returns (cleaned DataFrame, {stage name: log DataFrame}), or (None, logs)
+    when a stage's required columns are missing. Text emptied by a stage
+    becomes NaN, as it would after the CSV round trip between the old
+    standalone scripts, so later stages see the same values; both text
+    columns stay object dtype even when a stage leaves them all NaN.
+    after_stage(i, df, log) is called with each stage's result.
+    """
+    logs = {}
+    for i, stage in enumerate(stages):
+        missing = [c for c in stage.requires if c not in df.columns]
+        if missing:
+            print(f"Skipping {name} at stage {stage.name}: required columns not found ({', '.join(missing)})")
+            if after_stage is not None:
+                after_stage(i, None, None)
+            return None, logs
+        before = len(df)
+        df, log = stage(df)
+        for column in ('title', 'body'):
+            if column in df.columns:
+                df[column] = df[column].astype(object).mask(df[column] == '', np.nan)
+        if log is not None and len(log):
+            logs[stage.name] = log
+        if after_stage is not None:
+            after_stage(i, df, log)
+        print(f"{name} {stage.name}: kept {len(df)} of {before} rows, logged {0 if log is None else len(log)}")
+    return df, logs
+
+
+def run_cached(data, stages, cache, project, name="", runner=run_stages):
+    """run_stages() over raw CSV bytes, reusing and filling the stage cache.
+
+    Stages whose key (input hash plus every stage config up to it) is
+    cached are not run; the rest run from the last cached result. Returns
+    (df, logs, n_cached) where n_cached is how many stages were reused.
+    `runner` runs the remaining stages, run_stages() by default.
+    """
+    keys = stage_keys(hashlib.sha256(data).hexdigest(), stages)
+    start = cache.cached_prefix(project, keys)
+    logs = {}
+    for stage, key in zip(stages[:start], keys[:start]):
+        log = cache.log(project, key)
+        if log is not None and len(log):
+            logs[stage.name] = log
+    cache.prune(project, keys)
+
+    if start == 0:
+        df = pd.read_csv(io.BytesIO(data), encoding='utf-8')
+    else:
+        df = cache.rows(project, keys[start - 1])
+    if df is None or start == len(stages):
+        return df, logs, start
+
+    def store(i, stage_df, log):
+        cache.store(project, keys[start + i], stage_df, log)
+
+    df, new_logs = runner(df, stages[start:], name, after_stage=store)
+    logs.update(new_logs)
+    return df, logs, start
+
+
+def clean_file(input_dir, output_dir, csv_file, stages, cache=None, runner=run_stages):
+    """Clean one <project>_prs.csv; returns its {stage name: log} for the corpus-wide logs."""
+    print("New CSV file started to process")
+    base_name, ext = os.path.splitext(csv_file)
+    output_path = os.path.join(output_dir, f"{base_name}_cleaned{ext}")
+    try:
+        if cache is None:
+            df = pd.read_csv(os.path.join(input_dir, csv_file), encoding='utf-8')
+            df, project_logs = runner(df, stages, csv_file)
+            reused = 0
+        else:
+            with open(os.path.join(input_dir, csv_file), 'rb') as f:
+                data = f.read()
+            df, project_logs, reused = run_cached(data, stages, cache, base_name, csv_file, runner)
+        if df is None:
+            return project_logs
+        if reused == len(stages) and os.path.exists(output_path):
+            print(f"Unchanged {csv_file}: all {reused} stages cached, output kept")
+            return project_logs
+        df.to_csv(output_path, index=False, encoding='utf-8')
+        print(f"Processed {csv_file}: kept {len(df)} rows ({reused} of {len(stages)} stages cached)")
+        return project_logs
+    except Exception as e:
+        print(f"Error processing {csv_file}: {e}")
+        return {}
+
+
+def clean_corpus(input_dir, output_dir, stages, cache=None, runner=run_stages, project_workers=1):
+    """Read each *_prs.csv once, run every stage in memory, write each result and log once.
+
+    The cleaned project goes to <output_dir>/<name>_cleaned.csv and each
+    stage's log, concatenated over projects, to <output_dir>/<log name>.
+    With a StageCache, only stages whose input or configuration changed
+    are recomputed, and projects whose whole chain is cached are not
+    rewritten when their output already exists. With project_workers > 1,
+    that many projects are cleaned at once (meant for a ShardedRunner);
+    logs are still concatenated in file order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    csv_files = sorted(f for f in os.listdir(input_dir) if f.endswith('_prs.csv'))
+    with ThreadPoolExecutor(max_workers=project_workers) as executor:
+        project_logs = list(executor.map(
+            lambda csv_file: clean_file(input_dir, output_dir, csv_file, stages, cache, runner), csv_files))
+    logs = defaultdict(list)
+    for file_logs in project_logs:
+        for stage_name, log in file_logs.items():
+            logs[stage_name].append(log)
+
+    for stage in stages:
+        if logs[stage.name]:
+            log = pd.concat(logs[stage.name], ignore_index=True)
+            log_path = os.path.join(output_dir, stage.log_name)
+            log.to_csv(log_path, index=False, encoding='utf-8')
+            print(f"Saved {len(log)} {stage.name} log rows to {log_path}")
+        else:
+            print(f"Nothing was logged by {stage.name} in any project.")
+
+
+def parse_setting(setting):
+    """"stage.param=value" -> (stage, param, value), value parsed as JSON when possible."""
+    key, _, value = setting.partition('=')
+    stage, _, param = key.partition('.')
+    try:
+        value = json.loads(value)
+    except json.JSONDecodeError:
+        pass
+    return stage, param, value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean PR CSVs with the RQ3 pre-processing stages in one pass.")
+    parser.add_argument("input_dir", help="directory of <project>_prs.csv files")
+    parser.add_argument("output_dir", help="directory for <project>_prs_cleaned.csv files and stage logs")
+    parser.add_argument("--stages", nargs="+", default=DEFAULT_ORDER, choices=list(STAGES),
+                        help=f"stages to apply, in order (default: {' '.join(DEFAULT_ORDER)})")
+    parser.add_argument("--set", action="append", default=[], metavar="STAGE.PARAM=VALUE",
+                        help="override a stage parameter, e.g. templates.threshold=50")
+    parser.add_argument("--cache-dir", help=f"stage cache (default: <output_dir>/{CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="recompute every stage of every project")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to shard projects over by row range (default: 1, serial)")
+    parser.add_argument("--shard-rows", type=int, help="rows per shard with --workers (default: 2000)")
+    parser.add_argument("--chunk-rows", type=int,
+                        help="stream each project in chunks of this many rows instead of reading it whole "
+                             "(bounded memory, serial, no stage cache)")
+    args = parser.parse_args()
+    if args.chunk_rows and args.workers > 1:
+        parser.error("--chunk-rows cannot be combined with --workers")
+
+    config = defaultdict(dict)
+    for setting in args.set:
+        stage, param, value = parse_setting(setting)
+        config[stage][param] = value
+    cache = None if args.no_cache or args.chunk_rows else StageCache(args.cache_dir or os.path.join(args.output_dir, CACHE_DIR))
+    stages = build_stages(args.stages, config)
+    if args.chunk_rows:
+        from streaming import stream_corpus
+        stream_corpus(args.input_dir, args.output_dir, stages, args.chunk_rows)
+    elif args.workers > 1:
+        from sharded import SHARD_ROWS, ShardedRunner
+        runner = ShardedRunner(args.workers, args.shard_rows or SHARD_ROWS)
+        try:
+            clean_corpus(args.input_dir, args.output_dir, stages, cache, runner, project_workers=args.workers)
+        finally:
+            runner.close()
+    else:
+        clean_corpus(args.input_dir, args.output_dir, stages, cache)
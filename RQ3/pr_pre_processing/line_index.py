@@ -0,0 +1,86 @@
+import hashlib
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16
+# Lines with fewer distinct words are only matched exactly
+MIN_WORDS = 3
+
+
+def line_hash(text):
+    """64-bit hash of a text, the same in every process and run."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+
+
+class NearDuplicates:
+    """MinHash signatures of lines' word sets, for grouping lines that differ by a word or two.
+
+    add() computes a line's signature the first time its key is seen, so
+    memory grows with the number of distinct lines (NUM_PERM 32-bit values
+    each). groups() then clusters the lines around representatives: in the
+    order they were added, a line joins the most similar representative
+    sharing one of its LSH bands whose estimated Jaccard similarity reaches
+    `similarity`, or becomes a representative itself. Every line is thus
+    similar to its group's representative; groups are never merged through
+    a chain of lines that are each only similar to the next.
+    """
+
+    def __init__(self, similarity, num_perm=NUM_PERM, bands=BANDS, seed=1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: odd multipliers, keep the high 32 bits
+        self.a = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self.similarity = similarity
+        self.bands = bands
+        self.index = {}
+        self.signatures = []
+
+    def add(self, key, text):
+        if key in self.index:
+            return
+        words = set(text.split())
+        if len(words) < MIN_WORDS:
+            return
+        hashes = np.fromiter(map(line_hash, words), dtype=np.uint64, count=len(words))
+        signature = ((np.multiply.outer(hashes, self.a) + self.b) >> np.uint64(32)).min(axis=0)
+        self.index[key] = len(self.signatures)
+        self.signatures.append(signature.astype(np.uint32).tobytes())
+
+    def groups(self):
+        """{key: representative key} for every added line; representatives map to themselves."""
+        keys = list(self.index)
+        if not keys:
+            return {}
+        signatures = np.frombuffer(b''.join(self.signatures), dtype=np.uint32).reshape(len(keys), -1)
+        rows = signatures.shape[1] // self.bands
+        weights = np.uint64(0x9E3779B97F4A7C15) ** np.arange(1, rows + 1, dtype=np.uint64)
+        # One bucket id per (line, band): the band's hash with the band number in its low bits
+        shift = np.uint64(int(self.bands - 1).bit_length())
+        bucket_ids = np.stack([((signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * weights)
+                                .sum(axis=1) << shift) | np.uint64(band)
+                               for band in range(self.bands)], axis=1)
+
+        # Lines alone in all their buckets cannot join or take in another line
+        shared = np.zeros(len(keys), dtype=bool)
+        for band in range(self.bands):
+            _, inverse, counts = np.unique(bucket_ids[:, band], return_inverse=True, return_counts=True)
+            shared |= counts[inverse.ravel()] > 1
+
+        # bucket id -> representatives in that bucket
+        buckets = {}
+        representative = list(range(len(keys)))
+        for i, line_buckets in zip(np.nonzero(shared)[0].tolist(), bucket_ids[shared].tolist()):
+            best, best_similarity = i, self.similarity
+            candidates = [r for bucket in line_buckets if bucket in buckets for r in buckets[bucket]]
+            for r in sorted(set(candidates)):
+                similarity = (signatures[i] == signatures[r]).mean()
+                if similarity > best_similarity or (similarity == best_similarity and best == i):
+                    best, best_similarity = r, similarity
+            representative[i] = best
+            if best == i:
+                for bucket in line_buckets:
+                    buckets.setdefault(bucket, []).append(i)
+        return {key: keys[representative[i]] for i, key in enumerate(keys)}
@@ -0,0 +1,96 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from clean_pipeline import run_stages
+
+SHARD_ROWS = 2000
+
+
+def segments(stages):
+    """Split stages into runs that can be sharded by rows and single project-wide stages.
+
+    Yields (offset, stages, row_local) with offset the index of the run's
+    first stage.
+    """
+    start = 0
+    while start < len(stages):
+        end = start + 1
+        if stages[start].row_local:
+            while end < len(stages) and stages[end].row_local:
+                end += 1
+        yield start, stages[start:end], stages[start].row_local
+        start = end
+
+
+def run_shard(df, stages, name, keep_stages):
+    """Worker entry point: run a segment of stages on one row range.
+
+    Returns (df, logs, per-stage (df, log) results or None).
+    """
+    per_stage = [] if keep_stages else None
+    after_stage = (lambda i, stage_df, log: per_stage.append((stage_df, log))) if keep_stages else None
+    df, logs = run_stages(df, stages, name, after_stage)
+    return df, logs, per_stage
+
+
+def _concat(frames):
+    frames = [f for f in frames if f is not None and len(f)]
+    return pd.concat(frames) if frames else None
+
+
+class ShardedRunner:
+    """Drop-in for run_stages() that spreads row ranges of a project over a process pool.
+
+    Consecutive row-local stages run together on (project, row range)
+    shards; a stage that needs the whole project runs as one task on the
+    merged rows. Shards are merged in row order, so kept rows and logs come
+    out exactly as in a serial run. A semaphore shared by every caller
+    bounds the shards in flight, and with it the rows held in memory by
+    pending tasks.
+    """
+
+    def __init__(self, workers, shard_rows=SHARD_ROWS, max_in_flight=None):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.shard_rows = shard_rows
+        self.slots = threading.BoundedSemaphore(max_in_flight or 2 * workers)
+
+    def _submit(self, *args):
+        self.slots.acquire()
+        future = self.pool.submit(run_shard, *args)
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def __call__(self, df, stages, name="", after_stage=None):
+        logs = {}
+        for offset, segment, row_local in segments(stages):
+            step = self.shard_rows if row_local else max(len(df), 1)
+            futures = [self._submit(df.iloc[i:i + step], segment, f"{name}[{i}:{i + step}]", after_stage is not None)
+                       for i in range(0, max(len(df), 1), step)]
+            results = [future.result() for future in futures]
+            if any(shard_df is None for shard_df, _, _ in results):
+                if after_stage is not None:
+                    skipped_at = min(len(per_stage) for _, _, per_stage in results)
+                    for i in range(skipped_at):
+                        after_stage(offset + i, *self._merge_stage(results, i))
+                    after_stage(offset + skipped_at, None, None)
+                return None, logs
+
+            if after_stage is not None:
+                for i in range(len(segment)):
+                    after_stage(offset + i, *self._merge_stage(results, i))
+            df = pd.concat([shard_df for shard_df, _, _ in results])
+            for stage in segment:
+                log = _concat(shard_logs.get(stage.name) for _, shard_logs, _ in results)
+                if log is not None:
+                    logs[stage.name] = log
+        return df, logs
+
+    @staticmethod
+    def _merge_stage(results, i):
+        stage_df = pd.concat([per_stage[i][0] for _, _, per_stage in results])
+        return stage_df, _concat(per_stage[i][1] for _, _, per_stage in results)
+
+    def close(self):
+        self.pool.shutdown()
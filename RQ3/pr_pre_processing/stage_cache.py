@@ -0,0 +1,158 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import inspect
+from functools import lru_cache
+
+import pandas as pd
+
+CACHE_DIR = ".stage_cache"
+
+
+def _module_dir(obj):
+    """Directory of the module an object (or module) comes from, None for built-ins."""
+    module = obj if inspect.ismodule(obj) else sys.modules.get(getattr(obj, '__module__', None) or '')
+    path = getattr(module, '__file__', None)
+    return path and os.path.dirname(os.path.abspath(path))
+
+
+def _code_names(code):
+    """Global and attribute names used by a code object and the functions nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+
+def _constant(value):
+    """Stable text of a constant a stage reads (patterns, numbers, word lists), or None for anything else."""
+    if isinstance(value, re.Pattern):
+        return f"re.compile({value.pattern!r}, {value.flags})"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_constant(item) for item in value]
+        if None in items:
+            return None
+        return f"[{', '.join(sorted(items) if isinstance(value, (set, frozenset)) else items)}]"
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return repr(value)
+    return None
+
+
+@lru_cache(maxsize=None)
+def function_source(func):
+    """Source of a stage function and of the helpers, classes and constants beside it that it uses.
+
+    Names the function's code reads are followed recursively through the
+    modules of this directory (remove_templates -> TemplateLines ->
+    NearDuplicates -> MIN_WORDS, ...), so editing one helper only changes
+    the fingerprints of the stages that call it. Underscore globals are
+    lazily filled caches and are left out.
+    """
+    directory = _module_dir(func)
+    sources = {}
+    pending = [func]
+    while pending:
+        obj = pending.pop()
+        name = f"{obj.__module__}.{obj.__qualname__}"
+        if name in sources:
+            continue
+        sources[name] = inspect.getsource(obj)
+        members = [obj] if inspect.isfunction(obj) else vars(obj).values()
+        for member in members:
+            f = getattr(member, '__func__', getattr(member, 'fget', member))
+            if not inspect.isfunction(f):
+                continue
+            for n in sorted(_code_names(f.__code__)):
+                if n not in f.__globals__:
+                    continue
+                value = f.__globals__[n]
+                if inspect.isfunction(value) or inspect.isclass(value):
+                    if _module_dir(value) == directory:
+                        pending.append(value)
+                elif inspect.ismodule(value):
+                    # Attributes of a local module are not followed: the whole module is hashed
+                    if _module_dir(value) == directory:
+                        sources[value.__name__] = inspect.getsource(value)
+                elif not n.startswith('_'):
+                    text = _constant(value)
+                    if text is not None:
+                        sources[f"{f.__module__}.{n}"] = f"{n} = {text}\n"
+            defaults = (f.__defaults__ or ()) + tuple((f.__kwdefaults__ or {}).values())
+            if defaults:
+                sources[f"{f.__module__}.{f.__qualname__}()"] = f"defaults = {_constant(list(defaults))}\n"
+    return ''.join(sources[name] for name in sorted(sources))
+
+
+def stage_fingerprint(stage):
+    """Hash of a stage's name, parameters and the source of its function and helpers."""
+    config = json.dumps({"name": stage.name, "params": stage.params}, sort_keys=True, default=str)
+    return hashlib.sha256((config + function_source(stage.func)).encode("utf-8")).hexdigest()
+
+
+def stage_keys(input_digest, stages):
+    """Cache key after each stage: a hash chain over the input and every stage up to it.
+
+    Changing one stage's parameters changes its key and all later keys,
+    while the keys of the stages before it stay valid.
+    """
+    keys = []
+    key = input_digest
+    for stage in stages:
+        key = hashlib.sha256((key + stage_fingerprint(stage)).encode("utf-8")).hexdigest()
+        keys.append(key)
+    return keys
+
+
+class StageCache:
+    """Per-project outputs of the pipeline stages, stored under their stage_keys().
+
+    After every stage, the cleaned DataFrame (None when the project was
+    skipped at that stage) and its log are kept as <key>.rows.pkl and
+    <key>.log.pkl. A re-run resumes after the longest cached prefix of its
+    key chain, so only the changed stage and the stages after it run again;
+    prune() keeps only the entries of the current chain.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, project, key, part):
+        return os.path.join(self.path, project, f"{key}.{part}.pkl")
+
+    def has(self, project, key):
+        return all(os.path.exists(self._file(project, key, part)) for part in ("rows", "log"))
+
+    def cached_prefix(self, project, keys):
+        """Number of leading stages whose outputs are cached."""
+        n = 0
+        while n < len(keys) and self.has(project, keys[n]):
+            n += 1
+        return n
+
+    def rows(self, project, key):
+        return pd.read_pickle(self._file(project, key, "rows"))
+
+    def log(self, project, key):
+        return pd.read_pickle(self._file(project, key, "log"))
+
+    def store(self, project, key, df, log):
+        os.makedirs(os.path.join(self.path, project), exist_ok=True)
+        for part, value in (("rows", df), ("log", log)):
+            # The log is written last: its presence marks the entry complete
+            tmp = self._file(project, key, part) + ".tmp"
+            pd.to_pickle(value, tmp)
+            os.replace(tmp, self._file(project, key, part))
+
+    def prune(self, project, keys):
+        """Drop a project's entries that are not in its current key chain."""
+        project_dir = os.path.join(self.path, project)
+        if not os.path.isdir(project_dir):
+            return
+        keep = set(keys)
+        for name in os.listdir(project_dir):
+            if name.split(".", 1)[0] not in keep:
+                os.remove(os.path.join(project_dir, name))
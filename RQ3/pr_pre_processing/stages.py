@@ -0,0 +1,468 @@
+import re
+import ssl
+import math
+import sys
+import string
+from collections import Counter
+
+import emoji
+import numpy as np
+import pandas as pd
+import regex
+
+from line_index import NearDuplicates, line_hash
+
+
+class Stage:
+    """One cleaning step applied in memory to a project's PR DataFrame.
+
+    `func(df, **params)` returns the cleaned DataFrame and a log DataFrame
+    of what it removed (or None). `requires` lists the columns the step
+    needs and `log_name` is the CSV its logs of all projects are saved to.
+    A row-local step treats every row on its own, so it may run on any
+    slice of a project; the others need the whole project at once, unless
+    `stream(**params)` gives an object that can scan() a project chunk by
+    chunk and then apply() to each chunk and log() once.
+    """
+
+    def __init__(self, name, func, log_name, requires, row_local=True, stream=None, **params):
+        self.name = name
+        self.func = func
+        self.log_name = log_name
+        self.requires = requires
+        self.row_local = row_local
+        self.stream = stream
+        self.params = params
+
+    def configure(self, **params):
+        unknown = set(params) - set(self.params)
+        if unknown:
+            raise ValueError(f"Unknown parameters for stage {self.name}: {', '.join(sorted(unknown))}")
+        return Stage(self.name, self.func, self.log_name, self.requires, self.row_local, self.stream,
+                     **dict(self.params, **params))
+
+    def __call__(self, df):
+        return self.func(df, **self.params)
+
+
+def _changed(df, originals, columns):
+    """Rows where any cleaned column differs from its original, for the change logs."""
+    mask = pd.Series(False, index=df.index)
+    for column in originals:
+        mask |= originals[column] != df[column]
+    log = pd.DataFrame({c: (originals[c[len('original_'):]] if c.startswith('original_') else df[c])[mask]
+                        for c in columns})
+    return log if mask.any() else None
+
+
+# bump: version bump PRs ("Bump x from 1.0 to 1.1")
+BUMP_PAIRS = [("bump", "to"), ("bumped", "to"), ("bump", "up"), ("bumped", "up")]
+
+
+def remove_bumps(df, pairs=BUMP_PAIRS):
+    mask = pd.Series(False, index=df.index)
+    for word1, word2 in pairs:
+        pattern1 = r'\b' + re.escape(word1) + r'\b'
+        pattern2 = r'\b' + re.escape(word2) + r'\b'
+        mask |= (df['title'].str.contains(pattern1, case=False, regex=True, na=False) &
+                 df['title'].str.contains(pattern2, case=False, regex=True, na=False))
+    return df[~mask], df[mask]
+
+
+# templates: PR template lines repeated across a project's descriptions
+checkbox_pattern = re.compile(r'^\s*-\s*\[.\]\s*')
+
+
+def strip_checkbox(line):
+    return checkbox_pattern.sub('', line)
+
+
+class TemplateLines:
+    """Template detection over a project fed in chunks: scan() them all, then apply() each and log().
+
+    Lines are counted by the 64-bit line_hash() of their stripped form, in
+    a single pass, so memory grows with the number of distinct lines and
+    not with their length; the original spellings are only collected by
+    apply(), for the lines found to be templates. A line is a template
+    when it occurs at least `threshold` times or, with `share`, at least
+    share x (PRs in the project) times (and at least twice). With
+    `near_duplicates`, a Jaccard similarity of word sets, each line is
+    counted with the group of the representative line its MinHash
+    signature is that similar to (see NearDuplicates), so template lines
+    that differ by a word are found as well.
+    """
+
+    def __init__(self, threshold=100, share=None, near_duplicates=None):
+        self.threshold = threshold
+        self.share = share
+        self.near = None if near_duplicates is None else NearDuplicates(near_duplicates)
+        self.counts = Counter()
+        self.rows = 0
+        self.project = None
+        self.templates = None
+        self.originals = set()
+
+    def scan(self, df):
+        if self.project is None and len(df):
+            self.project = df['project'].iloc[0]
+        self.rows += len(df)
+        for desc in df['body'].dropna():
+            stripped = [strip_checkbox(line) for line in desc.split('\n')]
+            keys = list(map(line_hash, stripped))
+            if self.near is not None:
+                for key, text in zip(keys, stripped):
+                    self.near.add(key, text)
+            self.counts.update(keys)
+
+    def template_keys(self):
+        threshold = self.threshold if self.share is None else max(math.ceil(self.share * self.rows), 2)
+        if self.near is None:
+            return {key for key, count in self.counts.items() if count >= threshold}
+        groups = self.near.groups()
+        totals = Counter()
+        for key, count in self.counts.items():
+            totals[groups.get(key, key)] += count
+        return {key for key in self.counts if totals[groups.get(key, key)] >= threshold}
+
+    def apply(self, df):
+        if self.templates is None:
+            self.templates = self.template_keys()
+            self.counts = self.near = None
+
+        def filter_description(desc):
+            if pd.isna(desc):
+                return desc
+            kept = []
+            for line in desc.split('\n'):
+                if line_hash(strip_checkbox(line)) in self.templates:
+                    self.originals.add(line)
+                else:
+                    kept.append(line)
+            return '\n'.join(kept)
+
+        return df.assign(body=df['body'].apply(filter_description))
+
+    def log(self):
+        if not self.originals:
+            return None
+        return pd.DataFrame({'project': self.project, 'template_line': sorted(self.originals)})
+
+
+def remove_templates(df, threshold=100, share=None, near_duplicates=None):
+    if df.empty:
+        return df, None
+    templates = TemplateLines(threshold, share, near_duplicates)
+    templates.scan(df)
+    df = templates.apply(df)
+    return df, templates.log()
+
+
+# foreign: PRs written mostly in non-Latin scripts
+def non_latin_letter_ratio(text):
+    """Share of a text's letters that are not Latin script (reference for non_latin_ratios())."""
+    if not isinstance(text, str):
+        return 0
+    letters = regex.findall(r'\p{L}', text)
+    if not letters:
+        return 0
+    non_latin = [c for c in letters if not regex.match(r'\p{script=Latin}', c)]
+    return len(non_latin) / len(letters)
+
+
+NOT_LETTER, LATIN, NON_LATIN = 0, 1, 2
+# Code points classified per call of non_latin_ratios(); bounds its buffers
+BATCH_CHARS = 1 << 22
+_script_table = None
+
+
+def _code_points(texts):
+    return np.frombuffer(''.join(texts).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+
+def script_table():
+    """NOT_LETTER, LATIN or NON_LATIN for every code point, from the same regex classes as non_latin_letter_ratio()."""
+    global _script_table
+    if _script_table is None:
+        everything = ''.join(map(chr, range(sys.maxunicode + 1)))
+        table = np.zeros(sys.maxunicode + 1, dtype=np.uint8)
+        table[_code_points(regex.findall(r'\p{L}', everything))] = NON_LATIN
+        table[_code_points(regex.findall(r'(?=\p{L})\p{script=Latin}', everything))] = LATIN
+        _script_table = table
+    return _script_table
+
+
+def _batch_ratios(texts):
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    classes = script_table()[_code_points(texts)]
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    letters = np.concatenate([[0], np.cumsum(classes != NOT_LETTER)])
+    non_latin = np.concatenate([[0], np.cumsum(classes == NON_LATIN)])
+    n_letters = letters[ends] - letters[starts]
+    n_non_latin = non_latin[ends] - non_latin[starts]
+    return np.divide(n_non_latin, n_letters, out=np.zeros(len(texts)), where=n_letters > 0)
+
+
+def non_latin_ratios(texts):
+    """non_latin_letter_ratio() of many texts at once, as a float array.
+
+    The texts are encoded into one UTF-32 buffer per batch of about
+    BATCH_CHARS code points, looked up in script_table() and counted per
+    text with cumulative sums, so no Python code runs per character.
+    """
+    texts = [text if isinstance(text, str) else '' for text in texts]
+    ratios = []
+    batch_start, chars = 0, 0
+    for i, text in enumerate(texts):
+        chars += len(text)
+        if chars >= BATCH_CHARS:
+            ratios.append(_batch_ratios(texts[batch_start:i + 1]))
+            batch_start, chars = i + 1, 0
+    ratios.append(_batch_ratios(texts[batch_start:]))
+    return np.concatenate(ratios)
+
+
+_langid = None
+
+
+def detect_languages(texts):
+    """ISO 639-1 code of each text from langid (an optional dependency)."""
+    global _langid
+    if _langid is None:
+        try:
+            import langid as _langid
+        except ImportError:
+            raise RuntimeError("Language detection needs langid. Please run: pip install langid")
+    return [_langid.classify(text)[0] for text in texts]
+
+
+def remove_foreign(df, threshold=0.2, language=None):
+    """Drop PRs whose title or body has more than `threshold` non-Latin letters.
+
+    With `language` (e.g. 'en'), the rows that pass are also run through
+    language identification and kept only when detected as that language;
+    rows without any text are kept.
+    """
+    ratios = non_latin_ratios(list(df['title']) + list(df['body']))
+    keep = pd.Series((ratios[:len(df)] <= threshold) & (ratios[len(df):] <= threshold), index=df.index)
+    if language is not None:
+        text = (df['title'].fillna('') + '\n' + df['body'].fillna('')).str.strip()[keep]
+        keep[text.index] = [not t or detected == language for t, detected in zip(text, detect_languages(text))]
+    return df[keep], df.loc[~keep, ['project', 'title', 'body']]
+
+
+# readme: documentation-only PRs
+def remove_readme(df):
+    mask = df['title'].str.contains(r'\breadme\b', case=False, na=False, regex=True)
+    return df[~mask], df[mask]
+
+
+# links: URLs, emails and hashes in descriptions
+url_pattern = re.compile(r'http[s]?://\S+')
+email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+hash_pattern = re.compile(r'\b[a-fA-F0-9]{32,}\b')
+
+patterns = [
+    (url_pattern, 'URL'),
+    (email_pattern, 'Email'),
+    (hash_pattern, 'Hash')
+]
+
+
+def clean_links(text):
+    if not isinstance(text, str):
+        return text, []
+    removed = []
+    for pattern, name in patterns:
+        matches = pattern.findall(text)
+        if matches:
+            removed.extend([f"{name}: {m}" for m in matches])
+        text = pattern.sub('', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text, removed
+
+
+# One scan per description: the patterns that can match in it, as named
+# alternatives in the order above. A URL glued to the text before it is the one
+# case where removing the patterns one after another can give a different
+# result, so those descriptions fall back to clean_links().
+glued_url = re.compile(r'\S' + url_pattern.pattern)
+_scanners = {}
+
+
+def link_scanner(kinds):
+    if kinds not in _scanners:
+        _scanners[kinds] = re.compile('|'.join(f'(?P<{name}>{pattern.pattern})'
+                                               for pattern, name in patterns if name in kinds))
+    return _scanners[kinds]
+
+
+def scan_links(text):
+    """clean_links() with a single pass over the text.
+
+    Cheap substring checks ('http', '@') and a search for a hash rule out
+    patterns first; a description with none of them is only re-spaced.
+    """
+    if not isinstance(text, str):
+        return text, []
+    kinds = tuple(name for name, present in (('URL', 'http' in text), ('Email', '@' in text),
+                                              ('Hash', hash_pattern.search(text) is not None)) if present)
+    if not kinds:
+        return ' '.join(text.split()), []
+    if 'URL' in kinds and glued_url.search(text):
+        return clean_links(text)
+    found = {name: [] for name in kinds}
+
+    def record(match):
+        found[match.lastgroup].append(f"{match.lastgroup}: {match.group()}")
+        return ''
+
+    text = ' '.join(link_scanner(kinds).sub(record, text).split())
+    return text, [removed for name in kinds for removed in found[name]]
+
+
+def remove_links(df):
+    cleaned = [scan_links(body) for body in df['body']]
+    removed = [(project, pr_number, body if isinstance(body, str) else '', '; '.join(texts))
+               for (_, texts), project, pr_number, body in zip(cleaned, df['project'], df['pr_number'], df['body'])
+               if texts]
+    df = df.assign(body=[body for body, _ in cleaned])
+    log = pd.DataFrame(removed, columns=['project', 'pr_number', 'original_body', 'removed_text'])
+    return df, log if len(log) else None
+
+
+# title_keywords: ticket ids, tags and "scope:" prefixes of titles
+prefix_pattern = re.compile(
+    r'^(\[.*?\][:-]?|[\w/-]+-\d+[:-]?|[\w/-]+#\d+[:-]?|#\d+[:-]?|Release \d+\.\d+\.\d+[:-]?|\d+\.x[:-]?'
+    r'|[\w/-]+ \d+[:-]?|[\w/-]+-\d+\.\d+\.\d+[:-]?|[\w\d]+[:-])\s*'
+)
+
+
+def clean_title(title):
+    if not isinstance(title, str) or not title.strip():
+        return title, None
+    match = prefix_pattern.match(title)
+    if match:
+        removed = match.group(0).strip()
+        cleaned = title[match.end():].strip()
+        # Remove leading :, -, or spaces
+        cleaned = re.sub(r'^[:\-\s]+', '', cleaned)
+        return cleaned, removed
+    return title, None
+
+
+def remove_title_keywords(df):
+    result = [clean_title(title) for title in df['title']]
+    cleaned = df.assign(title=[title for title, _ in result])
+    prefixes = pd.Series([prefix for _, prefix in result], index=df.index, dtype=object)
+    mask = prefixes.notna()
+    log = pd.DataFrame({'project': df['project'], 'pr_number': df['pr_number'], 'original_title': df['title'],
+                        'title': cleaned['title'], 'removed_prefix': prefixes})[mask]
+    return cleaned, log if mask.any() else None
+
+
+# paths_numbers: paths, dotted names, numbers and punctuation tokens
+_word_tokenize = None
+
+
+def word_tokenize(text):
+    global _word_tokenize
+    if _word_tokenize is None:
+        # Bypass SSL verification for the NLTK download
+        try:
+            ssl._create_default_https_context = ssl._create_unverified_context
+        except AttributeError:
+            pass
+        import nltk
+        nltk.download('punkt')
+        nltk.download('punkt_tab')
+        from nltk.tokenize import word_tokenize as _word_tokenize
+    return _word_tokenize(text)
+
+
+def clean_tokens(text):
+    if not isinstance(text, str):
+        return text
+    cleaned_tokens = []
+    for token in word_tokenize(text):
+        if '/' in token or '\\' in token:
+            continue
+        if re.match(r'^\w+(?:\.\w+)+$', token):
+            continue
+        if re.match(r'^\d+(?:\.\d+)?$', token):
+            continue
+        if all(c in string.punctuation for c in token):
+            continue
+        cleaned_tokens.append(token)
+    return ' '.join(cleaned_tokens)
+
+
+def remove_paths_numbers(df):
+    cleaned = df.assign(body=df['body'].map(clean_tokens))
+    return cleaned, _changed(cleaned, {'body': df['body']}, ['project', 'pr_number', 'original_body', 'body'])
+
+
+# stop_words: NLTK English stop words
+_stop_words = None
+
+
+def stop_words():
+    global _stop_words
+    if _stop_words is None:
+        from nltk.corpus import stopwords
+        try:
+            _stop_words = set(stopwords.words('english'))
+        except LookupError:
+            raise RuntimeError("NLTK stop words not found. Please run: import nltk; nltk.download('stopwords')")
+    return _stop_words
+
+
+def remove_stopwords(text):
+    if not isinstance(text, str):
+        return text
+    return ' '.join(word for word in text.split() if word.lower() not in stop_words())
+
+
+def remove_stop_words(df):
+    cleaned = df.assign(title=df['title'].map(remove_stopwords), body=df['body'].map(remove_stopwords))
+    return cleaned, _changed(cleaned, {'title': df['title'], 'body': df['body']},
+                             ['project', 'pr_number', 'original_title', 'title', 'original_body', 'body'])
+
+
+# short_rows: PRs with almost no text left
+def remove_short_rows(df, min_length=5):
+    combined_length = df['title'].fillna('').str.len() + df['body'].fillna('').str.len()
+    mask = combined_length >= min_length
+    return df[mask], df[~mask]
+
+
+# emojis
+def strip_emojis(text):
+    if not isinstance(text, str):
+        return text
+    return emoji.replace_emoji(text, '').strip()
+
+
+def remove_emojis(df):
+    cleaned = df.assign(title=df['title'].map(strip_emojis), body=df['body'].map(strip_emojis))
+    return cleaned, _changed(cleaned, {'title': df['title'], 'body': df['body']},
+                             ['project', 'pr_number', 'original_title', 'title', 'original_body', 'body'])
+
+
+STAGES = {stage.name: stage for stage in [
+    Stage('bump', remove_bumps, 'all_removed_prs.csv', ('title',), pairs=BUMP_PAIRS),
+    Stage('templates', remove_templates, 'all_removed_templates.csv', ('project', 'body'), row_local=False,
+          stream=TemplateLines, threshold=100, share=None, near_duplicates=None),
+    Stage('foreign', remove_foreign, 'removed_non_english.csv', ('project', 'title', 'body'), threshold=0.2,
+          language=None),
+    Stage('readme', remove_readme, 'removed_readme_rows.csv', ('title',)),
+    Stage('links', remove_links, 'removed_texts.csv', ('project', 'pr_number', 'body')),
+    Stage('title_keywords', remove_title_keywords, 'removed_prefixes.csv', ('project', 'pr_number', 'title')),
+    Stage('paths_numbers', remove_paths_numbers, 'cleaned_description_logs.csv', ('project', 'pr_number', 'body')),
+    Stage('stop_words', remove_stop_words, 'cleaned_stopwords_log.csv', ('project', 'pr_number', 'title', 'body')),
+    Stage('short_rows', remove_short_rows, 'removed_short_rows.csv', ('title', 'body'), min_length=5),
+    Stage('emojis', remove_emojis, 'cleaned_emojis_log.csv', ('project', 'pr_number', 'title', 'body')),
+]}
+
+# The order the standalone scripts were chained in
+DEFAULT_ORDER = list(STAGES)
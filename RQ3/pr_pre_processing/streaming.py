@@ -0,0 +1,150 @@
+import os
+import csv
+import shutil
+from collections import defaultdict
+
+import pandas as pd
+
+from clean_pipeline import run_stages
+from stages import Stage
+
+CHUNK_ROWS = 5000
+SPOOL_DIR = ".stream_logs"
+
+
+def read_chunks(path, chunk_rows):
+    """(name, chunk) for a project CSV in chunks of chunk_rows rows, every column read as text.
+
+    Reading as text keeps each chunk's values independent of the rows in
+    other chunks (an integer column is not turned into floats by a missing
+    value further down the file). Names are "<file>[start:end]".
+    """
+    start = 0
+    for chunk in pd.read_csv(path, encoding='utf-8', dtype=str, chunksize=chunk_rows):
+        yield f"{os.path.basename(path)}[{start}:{start + len(chunk)}]", chunk
+        start += len(chunk)
+
+
+def _applied(stage, stream):
+    """A row-local Stage that applies a scanned stream to one chunk; its log comes from stream.log()."""
+    return Stage(stage.name, lambda df: (stream.apply(df), None), stage.log_name, stage.requires)
+
+
+def _append_csv(df, path, written, quoting=csv.QUOTE_MINIMAL):
+    df.to_csv(path, mode='a' if path in written else 'w', header=path not in written, index=False,
+              encoding='utf-8', quoting=quoting)
+    written.add(path)
+
+
+def stream_file(input_dir, output_dir, csv_file, stages, spool, chunk_rows=CHUNK_ROWS):
+    """Clean one <project>_prs.csv in bounded chunks, with one extra read per whole-project stage.
+
+    Each stage that needs the whole project (templates) gets a pass of its
+    own that runs the stages before it on every chunk and scans the result
+    into the stage's stream; the last pass applies everything, appends each
+    chunk to the output and spools the logs to <spool>/<stage>/<project>.csv,
+    every field quoted so that merge_logs() reads back values such as a
+    CRLF line's trailing carriage return unchanged. Returns {stage name:
+    spooled log path}.
+    """
+    print("New CSV file started to process")
+    base_name, ext = os.path.splitext(csv_file)
+    input_path = os.path.join(input_dir, csv_file)
+    output_path = os.path.join(output_dir, f"{base_name}_cleaned{ext}")
+    tmp_path = output_path + ".tmp"
+    written = set()
+    try:
+        chunk_stages = list(stages)
+        streams = {}
+        for i, stage in enumerate(stages):
+            if stage.row_local:
+                continue
+            if stage.stream is None:
+                raise ValueError(f"stage {stage.name} needs the whole project and cannot be streamed")
+            streams[i] = stage.stream(**stage.params)
+            print(f"Scanning {csv_file} for {stage.name}")
+            for name, chunk in read_chunks(input_path, chunk_rows):
+                chunk, _ = run_stages(chunk, chunk_stages[:i], name)
+                if chunk is None or any(c not in chunk.columns for c in stage.requires):
+                    break
+                streams[i].scan(chunk)
+            chunk_stages[i] = _applied(stage, streams[i])
+
+        kept = 0
+        skipped = False
+        logs = {}
+        for name, chunk in read_chunks(input_path, chunk_rows):
+            chunk, chunk_logs = run_stages(chunk, chunk_stages, name)
+            for stage_name, log in chunk_logs.items():
+                logs[stage_name] = os.path.join(spool, stage_name, f"{base_name}.csv")
+                _append_csv(log, logs[stage_name], written, csv.QUOTE_ALL)
+            if chunk is None:
+                skipped = True
+                continue
+            _append_csv(chunk, tmp_path, written)
+            kept += len(chunk)
+        for i, stream in streams.items():
+            log = stream.log()
+            if log is not None:
+                logs[stages[i].name] = os.path.join(spool, stages[i].name, f"{base_name}.csv")
+                _append_csv(log, logs[stages[i].name], written, csv.QUOTE_ALL)
+
+        if skipped:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return logs
+        os.replace(tmp_path, output_path)
+        print(f"Processed {csv_file}: kept {kept} rows")
+        return logs
+    except Exception as e:
+        print(f"Error processing {csv_file}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return {}
+
+
+def merge_logs(parts, log_path, chunk_rows=CHUNK_ROWS):
+    """Concatenate spooled log CSVs into log_path chunk by chunk; returns the number of rows.
+
+    Columns are aligned as pd.concat() would: in order of first appearance,
+    empty where a part lacks them. Values are copied as text.
+    """
+    columns = []
+    for part in parts:
+        columns.extend(c for c in pd.read_csv(part, nrows=0).columns if c not in columns)
+    written = set()
+    rows = 0
+    for part in parts:
+        for chunk in pd.read_csv(part, encoding='utf-8', dtype=str, keep_default_na=False, chunksize=chunk_rows):
+            _append_csv(chunk.reindex(columns=columns), log_path, written)
+            rows += len(chunk)
+    return rows
+
+
+def stream_corpus(input_dir, output_dir, stages, chunk_rows=CHUNK_ROWS):
+    """clean_corpus() with every project and log streamed through bounded chunks of rows.
+
+    Memory stays bounded by chunk_rows and, for template detection, by the
+    number of distinct stripped lines in a project, however large the
+    project files are. The stage cache is not used.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    spool = os.path.join(output_dir, SPOOL_DIR)
+    for stage in stages:
+        os.makedirs(os.path.join(spool, stage.name), exist_ok=True)
+    csv_files = sorted(f for f in os.listdir(input_dir) if f.endswith('_prs.csv'))
+    parts = defaultdict(list)
+    try:
+        for csv_file in csv_files:
+            for stage_name, part in stream_file(input_dir, output_dir, csv_file, stages, spool, chunk_rows).items():
+                parts[stage_name].append(part)
+
+        for stage in stages:
+            if parts[stage.name]:
+                log_path = os.path.join(output_dir, stage.log_name)
+                rows = merge_logs(parts[stage.name], log_path, chunk_rows)
+                print(f"Saved {rows} {stage.name} log rows to {log_path}")
+            else:
+                print(f"Nothing was logged by {stage.name} in any project.")
+    finally:
+        shutil.rmtree(spool, ignore_errors=True)
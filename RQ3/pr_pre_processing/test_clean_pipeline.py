@@ -0,0 +1,135 @@
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from clean_pipeline import build_stages, clean_corpus, parse_setting, run_stages
+from stage_cache import StageCache, function_source, stage_fingerprint
+from sharded import ShardedRunner
+from stages import STAGES
+from streaming import SPOOL_DIR, stream_corpus
+
+# Stages that run without NLTK data
+OFFLINE = ['bump', 'templates', 'foreign', 'readme', 'links', 'title_keywords', 'short_rows', 'emojis']
+
+TITLES = ["Fix crash on startup", "Bump lodash from 1.0 to 1.1", "Update README", "[core] Add parser",
+          "JIRA-12: handle nulls", "修复缓存问题", "Refactor 🙂 handler", "ok", ""]
+BODIES = ["See https://example.com/x and mail me@example.org", "## Description\n- [ ] Tests added\nDetails here",
+          "## Summary\r\n- [ ] Docs updated\r\nSee below",
+          "commit " + "a" * 40, "Обновление документации", "", None, "short", "🙂 Thanks!\n\nMore text here"]
+
+
+def write_corpus(directory, n_projects=3, n_rows=120, seed=0):
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    for p in range(n_projects):
+        df = pd.DataFrame({'project': f"p{p}", 'pr_number': range(n_rows),
+                           'title': [rng.choice(TITLES) for _ in range(n_rows)],
+                           'body': [rng.choice(BODIES) for _ in range(n_rows)]})
+        df.to_csv(os.path.join(directory, f"p{p}_prs.csv"), index=False)
+
+
+def read_outputs(directory):
+    return {name: open(os.path.join(directory, name), 'rb').read()
+            for name in sorted(os.listdir(directory)) if name.endswith('.csv')}
+
+
+def test_build_stages_applies_overrides():
+    stages = build_stages(['templates', 'short_rows'], {'templates': {'threshold': 3}})
+    assert [stage.name for stage in stages] == ['templates', 'short_rows']
+    assert stages[0].params['threshold'] == 3
+    with pytest.raises(ValueError):
+        build_stages(['nope'])
+    with pytest.raises(ValueError):
+        build_stages(['templates'], {'templates': {'nope': 1}})
+
+
+def test_parse_setting():
+    assert parse_setting("templates.threshold=50") == ('templates', 'threshold', 50)
+    assert parse_setting("foreign.language=en") == ('foreign', 'language', 'en')
+
+
+def test_run_stages_turns_emptied_text_into_nan():
+    df = pd.DataFrame({'project': 'p', 'pr_number': [1, 2], 'title': ['🙂', 'Keep me'], 'body': ['🙂', np.nan]})
+    cleaned, logs = run_stages(df, build_stages(['emojis']))
+    assert cleaned['title'].isna().tolist() == [True, False]
+    assert cleaned['body'].isna().all() and cleaned['body'].dtype == object
+    assert 1 in logs['emojis']['pr_number'].tolist()
+
+
+def test_run_stages_skips_project_missing_columns():
+    df = pd.DataFrame({'project': 'p', 'title': ['Fix']})
+    cleaned, _ = run_stages(df, build_stages(['bump', 'templates']))
+    assert cleaned is None
+
+
+def test_clean_corpus_writes_outputs_and_logs(tmp_path):
+    write_corpus(tmp_path / "in")
+    clean_corpus(tmp_path / "in", tmp_path / "out", build_stages(OFFLINE))
+    outputs = read_outputs(tmp_path / "out")
+    assert {f"p{p}_prs_cleaned.csv" for p in range(3)} <= set(outputs)
+    bumps = pd.read_csv(tmp_path / "out" / "all_removed_prs.csv")
+    # Logs are concatenated in file order
+    assert bumps['project'].tolist() == sorted(bumps['project'])
+    assert bumps['title'].str.startswith('Bump').all()
+
+
+def test_stage_cache_reuses_and_resumes(tmp_path, capsys):
+    write_corpus(tmp_path / "in")
+    clean_corpus(tmp_path / "in", tmp_path / "plain", build_stages(OFFLINE, {'short_rows': {'min_length': 9}}))
+    cache = StageCache(tmp_path / "cache")
+    clean_corpus(tmp_path / "in", tmp_path / "out", build_stages(OFFLINE), cache)
+    clean_corpus(tmp_path / "in", tmp_path / "out", build_stages(OFFLINE), cache)
+    assert capsys.readouterr().out.count("Unchanged") == 3
+    assert len(list((tmp_path / "cache" / "p0_prs").glob("*.rows.pkl"))) == len(OFFLINE)
+
+    # Only short_rows and the stages after it run again
+    clean_corpus(tmp_path / "in", tmp_path / "out", build_stages(OFFLINE, {'short_rows': {'min_length': 9}}), cache)
+    out = capsys.readouterr().out
+    assert "(6 of 8 stages cached)" in out
+    assert "p0_prs.csv links:" not in out and "p0_prs.csv short_rows:" in out
+    # Entries of the old chain are pruned
+    assert len(list((tmp_path / "cache" / "p0_prs").glob("*.pkl"))) == 2 * len(OFFLINE)
+    assert read_outputs(tmp_path / "out") == read_outputs(tmp_path / "plain")
+
+
+def test_stage_fingerprint_covers_own_helpers():
+    links = function_source(STAGES['links'].func)
+    assert 'def scan_links' in links and 'def link_scanner' in links and 'hash_pattern = ' in links
+    assert 'class TemplateLines' not in links
+    templates = function_source(STAGES['templates'].func)
+    assert 'class NearDuplicates' in templates and 'MIN_WORDS = 3' in templates and 'def scan_links' not in templates
+    changed = STAGES['templates'].configure(threshold=5)
+    assert stage_fingerprint(changed) != stage_fingerprint(STAGES['templates'])
+
+
+def test_sharded_runner_matches_serial(tmp_path):
+    write_corpus(tmp_path / "in", n_rows=300)
+    stages = build_stages(OFFLINE, {'templates': {'threshold': 20}})
+    clean_corpus(tmp_path / "in", tmp_path / "serial", stages)
+    runner = ShardedRunner(workers=2, shard_rows=70)
+    try:
+        clean_corpus(tmp_path / "in", tmp_path / "sharded", stages, runner=runner, project_workers=2)
+    finally:
+        runner.close()
+    assert read_outputs(tmp_path / "sharded") == read_outputs(tmp_path / "serial")
+
+
+def test_streaming_matches_in_memory(tmp_path):
+    write_corpus(tmp_path / "in", n_rows=300)
+    stages = build_stages(OFFLINE, {'templates': {'threshold': 20}})
+    clean_corpus(tmp_path / "in", tmp_path / "memory", stages)
+    stream_corpus(tmp_path / "in", tmp_path / "stream", stages, chunk_rows=70)
+    # CRLF template lines keep their trailing \r
+    assert b"## Summary\r\n" in read_outputs(tmp_path / "memory")['all_removed_templates.csv']
+    assert read_outputs(tmp_path / "stream") == read_outputs(tmp_path / "memory")
+    assert not os.path.exists(tmp_path / "stream" / SPOOL_DIR)
+
+
+def test_streaming_keeps_empty_projects(tmp_path):
+    os.makedirs(tmp_path / "in")
+    pd.DataFrame(columns=['project', 'pr_number', 'title', 'body']).to_csv(tmp_path / "in" / "e_prs.csv", index=False)
+    stream_corpus(tmp_path / "in", tmp_path / "out", build_stages(OFFLINE))
+    assert list(pd.read_csv(tmp_path / "out" / "e_prs_cleaned.csv").columns) == ['project', 'pr_number', 'title', 'body']
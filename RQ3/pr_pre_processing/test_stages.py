@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+import stages
+from stages import clean_links, non_latin_letter_ratio, non_latin_ratios, remove_foreign, remove_links, scan_links
+
+LINK_TEXTS = [
+    "See https://example.com/x and mail me@example.org",
+    "hash " + "f" * 40 + " end",
+    "foo  https://a.b/c  bar\tbaz ",
+    "x@y.comhttp://z.org a",
+    "a" + "ab" * 16 + "http://q b",
+    "a@b.cohttps://x y",
+    "mail " + "0" * 32 + "@x.com",
+    "https://x.com/" + "a" * 40,
+    " lead  x@y.de\x1c",
+    "no links at all",
+    "",
+    "  ",
+    None,
+    np.nan,
+]
+
+
+def test_scan_links_matches_clean_links():
+    for text in LINK_TEXTS:
+        assert scan_links(text) == clean_links(text)
+
+
+def test_remove_links_logs_removed_texts():
+    df = pd.DataFrame({'project': 'p', 'pr_number': [1, 2, 3],
+                       'body': ["a https://x.io b me@x.org " + "c" * 32, "plain", None]})
+    cleaned, log = remove_links(df)
+    assert cleaned['body'].tolist()[:2] == ["a b", "plain"]
+    assert log['pr_number'].tolist() == [1]
+    assert log['removed_text'].iloc[0] == "URL: https://x.io; Email: me@x.org; Hash: " + "c" * 32
+
+
+SCRIPT_TEXTS = ["Fix the build", "修复 the cache", "Ошибка", "Ελληνικά and Latin", "ǅ ﬁ Ⅻ ª º", "🙂 123 !!", "",
+                None, np.nan, "café naïve", "テスト test"]
+
+
+def test_non_latin_ratios_match_reference():
+    expected = np.array([non_latin_letter_ratio(text) for text in SCRIPT_TEXTS], dtype=float)
+    assert (non_latin_ratios(SCRIPT_TEXTS) == expected).all()
+
+
+def test_non_latin_ratios_across_batches(monkeypatch):
+    expected = non_latin_ratios(SCRIPT_TEXTS * 20)
+    monkeypatch.setattr(stages, 'BATCH_CHARS', 16)
+    assert (non_latin_ratios(SCRIPT_TEXTS * 20) == expected).all()
+
+
+def test_remove_foreign_threshold():
+    df = pd.DataFrame({'project': 'p', 'title': ["Fix bug", "修复错误", "Fix 修"], 'body': [None, "text", "ok"]})
+    kept, removed = remove_foreign(df)
+    assert kept['title'].tolist() == ["Fix bug"]
+    assert removed['title'].tolist() == ["修复错误", "Fix 修"]
+    kept, _ = remove_foreign(df, threshold=0.5)
+    assert kept['title'].tolist() == ["Fix bug", "Fix 修"]
@@ -0,0 +1,122 @@
+import random
+from collections import Counter
+
+import pandas as pd
+
+from line_index import NearDuplicates, line_hash
+from stages import TemplateLines, remove_templates, strip_checkbox
+
+WORDS = [f"word{i}" for i in range(400)]
+
+
+def reference_templates(df, threshold=100):
+    """The string-counting template detection the hashed index replaced."""
+    stripped_to_original = {}
+    counts = Counter()
+    for desc in df['body'].dropna():
+        for line in desc.split('\n'):
+            stripped = strip_checkbox(line)
+            counts[stripped] += 1
+            stripped_to_original.setdefault(stripped, set()).add(line)
+    templates = {stripped for stripped, count in counts.items() if count >= threshold}
+    body = df['body'].map(lambda desc: desc if pd.isna(desc) else
+                          '\n'.join(line for line in desc.split('\n') if strip_checkbox(line) not in templates))
+    lines = sorted(line for stripped in templates for line in stripped_to_original[stripped])
+    return body, lines
+
+
+def project(bodies):
+    return pd.DataFrame({'project': 'p', 'pr_number': range(len(bodies)), 'body': bodies})
+
+
+def synthetic_bodies(n_rows, seed=0):
+    rng = random.Random(seed)
+    template = ["## Description", "- [ ] Tests added", "- [x] Tests added", "", "Fixes #"]
+    bodies = []
+    for _ in range(n_rows):
+        lines = [line for line in template if rng.random() < 0.8]
+        lines += [' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 8))) for _ in range(rng.randint(0, 4))]
+        rng.shuffle(lines)
+        bodies.append(None if rng.random() < 0.05 else '\n'.join(lines))
+    return bodies
+
+
+def test_default_output_matches_string_counting():
+    df = project(synthetic_bodies(400))
+    for threshold in (2, 100, 300, 1000):
+        cleaned, log = remove_templates(df, threshold=threshold)
+        body, lines = reference_templates(df, threshold)
+        assert cleaned['body'].equals(body)
+        assert (log['template_line'].tolist() if log is not None else []) == lines
+
+
+def test_chunked_scan_matches_whole_project():
+    df = project(synthetic_bodies(400, seed=1))
+    templates = TemplateLines(threshold=50)
+    for start in range(0, len(df), 70):
+        templates.scan(df.iloc[start:start + 70])
+    chunks = [templates.apply(df.iloc[start:start + 70]) for start in range(0, len(df), 70)]
+    cleaned, log = remove_templates(df, threshold=50)
+    assert pd.concat(chunks)['body'].equals(cleaned['body'])
+    assert templates.log().equals(log)
+
+
+def test_share_threshold_scales_with_project_size():
+    # "Shared line" occurs in 30% of PRs, "Rare line" in 10%
+    bodies = [f"Shared line\nunique {i}" if i % 10 < 3 else f"unique {i}" for i in range(200)]
+    bodies = [body + "\nRare line" if i % 10 == 9 else body for i, body in enumerate(bodies)]
+    df = project(bodies)
+    _, log = remove_templates(df, share=0.25)
+    assert log['template_line'].tolist() == ["Shared line"]
+    _, log = remove_templates(df, share=0.05)
+    assert log['template_line'].tolist() == ["Rare line", "Shared line"]
+    # The fixed threshold is not used once a share is given
+    _, log = remove_templates(df, threshold=1, share=0.5)
+    assert log is None
+
+
+def test_share_threshold_floor_of_two():
+    # share x 3 PRs rounds up to 1, but a line seen once is never a template
+    df = project(["once\nshared", "twice\nshared", "twice"])
+    _, log = remove_templates(df, share=0.1)
+    assert log['template_line'].tolist() == ["shared", "twice"]
+
+
+def test_line_hash_is_stable():
+    assert line_hash("- [ ] Tests added") == line_hash("- [ ] Tests added")
+    assert line_hash("a") != line_hash("b")
+    assert 0 <= line_hash("a") < 2 ** 64
+
+
+def test_near_duplicates_group_lines_differing_by_a_word():
+    base = "Please describe the change you made in {} pull request and link the issue"
+    bodies = [base.format(["this", "the", "your", "our"][i % 4]) for i in range(120)]
+    df = project(bodies)
+    assert remove_templates(df)[1] is None
+    cleaned, log = remove_templates(df, near_duplicates=0.7)
+    assert len(log) == 4
+    assert cleaned['body'].isna().all() or (cleaned['body'].fillna('') == '').all()
+
+
+def test_near_duplicates_do_not_chain():
+    # Each line differs from the previous one by one word; the first and last share no words
+    rng = random.Random(2)
+    line = rng.sample(WORDS, 12)
+    fresh = iter(w for w in WORDS if w not in line)
+    lines = []
+    for i in range(150):
+        lines.append(' '.join(line))
+        line = line[:]
+        line[i % 12] = next(fresh)
+    assert not set(lines[0].split()) & set(lines[-1].split())
+    df = project(lines)
+    cleaned, log = remove_templates(df, near_duplicates=0.7)
+    assert log is None
+    assert cleaned['body'].equals(df['body'])
+
+    near = NearDuplicates(0.7)
+    keys = [line_hash(text) for text in lines]
+    for key, text in zip(keys, lines):
+        near.add(key, text)
+    groups = Counter(near.groups().values())
+    assert max(groups.values()) < 10